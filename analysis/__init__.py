@@ -4,6 +4,17 @@
 用于分析 docs_annotation 输出的标注结果，为 query 抽取提供数据支撑。
 """
 
-from .analyzer import AnnotationAnalyzer
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .analyzer import AnnotationAnalyzer
 
 __all__ = ["AnnotationAnalyzer"]
+
+
+def __getattr__(name: str):
+    """按需导入 AnnotationAnalyzer（PEP 562），避免导入包时加载分析器"""
+    if name == "AnnotationAnalyzer":
+        from .analyzer import AnnotationAnalyzer
+        return AnnotationAnalyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,15 +11,10 @@
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
-# 添加项目根目录到 path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
-from analysis.analyzer import AnnotationAnalyzer
-
 
 def main():
     parser = argparse.ArgumentParser(
@@ -76,6 +71,13 @@ def main():
         help="高复杂度阈值，压力点 >= N 视为高复杂度 (默认: 3)",
     )
     
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="并行加载 JSON 的进程数 (默认: CPU 核数，1 表示不启用多进程)",
+    )
+    
     parser.add_argument(
         "--json-only",
         action="store_true",
@@ -118,22 +120,30 @@ def main():
         print("  uv run python docs_annotation/batch_annotate.py --input <文档目录>")
         sys.exit(1)
     
+    # 延迟导入分析器：--help、参数错误、目录缺失等路径无需承担导入开销
+    project_root = Path(__file__).parent.parent
+    sys.path.insert(0, str(project_root))
+    from analysis.analyzer import AnnotationAnalyzer, _iter_json_files
+
     # 检查是否有 JSON 文件
-    json_files = list(input_path.rglob("*.json"))
+    json_files = sorted(_iter_json_files(str(input_path)))
     if not json_files:
         print(f"错误: 目录中没有 JSON 文件: {input_path}")
         sys.exit(1)
     
     if not args.quiet:
-        print("=" * 60)
-        print("文档标注分析工具")
-        print("=" * 60)
-        print(f"输入目录: {input_path}")
-        print(f"输出目录: {output_path}")
-        print(f"发现 {len(json_files)} 个 JSON 文件")
-        print(f"稀疏桶阈值: {args.sparse_threshold}")
-        print(f"高复杂度阈值: {args.complexity_threshold}")
-        print("-" * 60)
+        header = [
+            "=" * 60,
+            "文档标注分析工具",
+            "=" * 60,
+            f"输入目录: {input_path}",
+            f"输出目录: {output_path}",
+            f"发现 {len(json_files)} 个 JSON 文件",
+            f"稀疏桶阈值: {args.sparse_threshold}",
+            f"高复杂度阈值: {args.complexity_threshold}",
+            "-" * 60,
+        ]
+        sys.stdout.write("\n".join(header) + "\n")
     
     try:
         # 创建分析器
@@ -141,6 +151,9 @@ def main():
             input_dir=str(input_path),
             sparse_threshold=args.sparse_threshold,
             complexity_threshold=args.complexity_threshold,
+            file_list=json_files,
+            workers=args.workers,
+            keep_raw=False,  # CLI 只输出报告，无需保留完整的原始标注
         )
         
         # 输出报告
@@ -159,28 +172,30 @@ def main():
         else:
             analyzer.export_all(str(output_path))
         
+        # 报告列表与简要摘要合并为一次写出（仅取摘要所需的分项，复用导出时已缓存的结果）
         if not args.quiet:
-            print("-" * 60)
-            print("生成的报告文件:")
-            for f in sorted(output_path.iterdir()):
-                print(f"  - {f.name}")
-            print("=" * 60)
-        
-        # 打印简要摘要
-        if not args.quiet:
-            full_analysis = analyzer.run_full_analysis()
-            basic = full_analysis["basic_stats"]
-            advice = full_analysis["sampling_advice"]
+            with os.scandir(output_path) as it:
+                names = sorted(entry.name for entry in it if entry.is_file())
+            lines = ["-" * 60, "生成的报告文件:"]
+            lines.extend(f"  - {name}" for name in names)
+            lines.append("=" * 60)
             
-            print("\n[快速摘要]")
-            print(f"  文件总数: {basic['total_files']}")
-            print(f"  文件类型: {', '.join(f'{k}({v})' for k, v in basic.get('file_types', {}).items())}")
-            print(f"  高复杂度文档: {advice.get('priority_docs_count', 0)} 个")
-            print(f"  建议 per_file_type: {advice.get('recommended_per_file_type', 'N/A')}")
+            basic = analyzer.basic_stats
+            advice = analyzer.sampling_advice
+            file_types = ', '.join(f'{k}({v})' for k, v in basic.get('file_types', {}).items())
+            lines += [
+                "\n[快速摘要]",
+                f"  文件总数: {basic['total_files']}",
+                f"  文件类型: {file_types}",
+                f"  高复杂度文档: {advice.get('priority_docs_count', 0)} 个",
+                f"  建议 per_file_type: {advice.get('recommended_per_file_type', 'N/A')}",
+            ]
             
-            gaps = full_analysis["gaps"]
+            gaps = analyzer.gaps
             if gaps.get("sparse_buckets") or gaps.get("missing_features"):
-                print("\n[警告] 发现覆盖缺口，详见 REPORT.md")
+                lines.append("\n[警告] 发现覆盖缺口，详见 REPORT.md")
+            
+            sys.stdout.write("\n".join(lines) + "\n")
         
     except FileNotFoundError as e:
         print(f"错误: {e}")
@@ -6,36 +6,115 @@
 
 import json
 import csv
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Set, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Set, Tuple, Optional
 from collections import defaultdict, Counter
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到 ujson / 标准库 json
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+# 并行加载时每个任务批次包含的文件数（摊薄进程间序列化开销）
+LOAD_CHUNKSIZE = 32
+
+# 写出 Markdown / CSV 报告时的缓冲区大小（64 KiB）
+MARKDOWN_BUFFER_SIZE = 64 * 1024
+CSV_BUFFER_SIZE = 64 * 1024
+
+
+def _json_loads(raw: bytes) -> Any:
+    """解析 JSON 字节串（优先使用 orjson，其次 ujson）"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    if ujson is not None:
+        return ujson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _json_dumps(obj: Any, compact: bool = False) -> bytes:
+    """序列化为保留非 ASCII 字符的 UTF-8 JSON 字节串（默认缩进 2 格，优先使用 orjson）"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, option=option)
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _iter_json_files(root: str) -> Iterator[str]:
+    """递归遍历目录，返回所有 JSON 文件路径（基于 os.scandir，避免逐项创建 Path 对象）"""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".json") and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+
+def _read_annotation(json_file: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """读取单个标注文件，返回 (路径, 数据, 错误信息)（模块级函数，便于多进程调用）"""
+    try:
+        with open(json_file, "rb") as f:
+            return json_file, _json_loads(f.read()), None
+    except (ValueError, IOError) as e:  # 覆盖各解析库的 JSONDecodeError 及 UnicodeDecodeError
+        return json_file, None, str(e)
+
+
+@dataclass
+class PrimaryCounters:
+    """对标注列表单次遍历得到的基础计数（基础统计、标签分布、压力点组合共用）"""
+    total: int = 0
+    file_type_counter: Counter = field(default_factory=Counter)
+    folder_counter: Counter = field(default_factory=Counter)
+    layout_counter: Counter = field(default_factory=Counter)
+    stressor_mask_counter: Counter = field(default_factory=Counter)
+    stressor_count_counter: Counter = field(default_factory=Counter)
+    stressor_combo_counter: Counter = field(default_factory=Counter)
+    doc_masks: List[Tuple[str, int]] = field(default_factory=list)
+    ft_by_id: Dict[Any, Any] = field(default_factory=dict)
+    tag_counts: Dict[str, Tuple[int, int, int]] = field(default_factory=dict)
 
 
 class AnnotationAnalyzer:
     """标注结果分析器"""
     
     # 所有文档类型通用的标签
-    COMMON_TAGS = [
+    COMMON_TAGS = (
         "layout",
         "has_image",
         "has_table", 
         "has_formula",
         "has_chart",
         "image_text_mixed",
-    ]
+    )
     
     # PDF 专属标签
-    PDF_ONLY_TAGS = [
+    PDF_ONLY_TAGS = (
         "reading_order_sensitive",
         "table_profile.long_table",
         "table_profile.cross_page_table",
         "table_profile.table_dominant",
         "chart_profile.cross_page_chart",
-    ]
+    )
     
     # 压力点标签（用于 query 抽取）
-    STRESSOR_TAGS = [
+    STRESSOR_TAGS = (
         "has_image",
         "has_table",
         "has_formula", 
@@ -46,13 +125,26 @@ class AnnotationAnalyzer:
         "table_profile.cross_page_table",
         "table_profile.table_dominant",
         "chart_profile.cross_page_chart",
-    ]
+    )
+    
+    # 压力点位掩码的位序：STRESSOR_TAGS 之后依次为 layout 类压力点
+    _STRESSOR_BITS = STRESSOR_TAGS + ("layout=double", "layout=mixed")
+    _STRESSOR_BIT_INDEX = {name: bit for bit, name in enumerate(_STRESSOR_BITS)}
+    
+    # 全部标签（通用 + PDF 专属，顺序决定报告中的输出顺序）
+    ALL_TAGS = COMMON_TAGS + PDF_ONLY_TAGS
+    
+    # 预先拆分的标签路径 (标签, 路径分段)，避免每次取值都重复 split
+    _PARSED_TAGS = tuple((tag, tuple(tag.split("."))) for tag in ALL_TAGS)
     
     def __init__(
         self,
         input_dir: str,
         sparse_threshold: int = 3,
         complexity_threshold: int = 3,
+        file_list: Optional[List[str]] = None,
+        workers: int = 1,
+        keep_raw: bool = True,
     ):
         """
         初始化分析器
@@ -61,10 +153,20 @@ class AnnotationAnalyzer:
             input_dir: 标注输出目录路径
             sparse_threshold: 稀疏桶阈值（文件数 < N 视为稀疏）
             complexity_threshold: 高复杂度阈值（压力点 >= N 视为高复杂度）
+            file_list: 可选，已收集好的 JSON 文件路径列表（提供时不再扫描目录）
+            workers: 加载 JSON 的并行进程数（<= 1 时在当前进程顺序加载）
+            keep_raw: 是否保留完整的原始标注；为 False 时每条标注只保留分析所需字段，
+                      大语料下可显著降低内存占用
         """
         self.input_dir = Path(input_dir)
         self.sparse_threshold = sparse_threshold
         self.complexity_threshold = complexity_threshold
+        self.file_list = file_list
+        self.workers = workers
+        self.keep_raw = keep_raw
+        
+        # 完整分析结果缓存（导出 JSON/CSV/Markdown 时复用）
+        self._full_analysis: Optional[Dict] = None
         
         # 加载所有标注数据
         self.annotations: List[Dict[str, Any]] = []
@@ -76,49 +178,218 @@ class AnnotationAnalyzer:
         if not self.input_dir.exists():
             raise FileNotFoundError(f"输入目录不存在: {self.input_dir}")
         
-        for json_file in self.input_dir.rglob("*.json"):
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # 添加来源信息
-                    data["_source_file"] = str(json_file)
-                    data["_folder"] = json_file.parent.name if json_file.parent != self.input_dir else "_root"
-                    self.annotations.append(data)
-                    self.by_folder[data["_folder"]].append(data)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"警告: 无法加载 {json_file}: {e}")
-    
-    def _get_nested_value(self, data: Dict, key: str) -> Any:
-        """获取嵌套字典中的值，支持点号分隔的路径"""
-        keys = key.split(".")
+        if self.file_list is not None:
+            json_files = [str(p) for p in self.file_list]
+        else:
+            json_files = list(_iter_json_files(str(self.input_dir)))
+        
+        # 文件较多时按批分发到多个进程解析，结果按原顺序合并
+        if self.workers > 1 and len(json_files) > LOAD_CHUNKSIZE:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                self._collect_annotations(
+                    executor.map(_read_annotation, json_files, chunksize=LOAD_CHUNKSIZE)
+                )
+        else:
+            self._collect_annotations(map(_read_annotation, json_files))
+    
+    def _collect_annotations(self, results):
+        """合并加载结果：跳过读取失败的文件，其余交给 stream_analyze 逐条处理"""
+        def parsed():
+            for source_file, data, error in results:
+                if error is not None:
+                    print(f"警告: 无法加载 {source_file}: {error}")
+                    continue
+                yield source_file, data
+        
+        self.stream_analyze(parsed())
+    
+    def stream_analyze(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        流式接入已解析的标注数据
+        
+        逐条消费 (文件路径, 标注数据) 并补充来源信息，单次遍历即可完成接入，
+        不需要预先收集完整的文件列表。接入新数据后会清空完整分析结果缓存。
+        
+        Args:
+            records: (文件路径, 已解析的标注字典) 迭代器
+            
+        Returns:
+            本次接入的标注数量
+        """
+        count = 0
+        for source_file, data in records:
+            if not self.keep_raw:
+                data = self._slim_annotation(data)
+            json_file = Path(source_file)
+            # 添加来源信息
+            data["_source_file"] = str(source_file)
+            data["_folder"] = json_file.parent.name if json_file.parent != self.input_dir else "_root"
+            self._get_flat_profile(data)
+            self.annotations.append(data)
+            self.by_folder[data["_folder"]].append(data)
+            count += 1
+        
+        if count:
+            self._invalidate_cache()
+        return count
+    
+    def _slim_annotation(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        裁剪标注，只保留分析所需的字段
+        
+        保留 doc_id、file_type 以及 profile 中各标签路径上的原始值
+        （缺失的键仍然缺失，保证各分析方法的默认值逻辑不变）。
+        """
+        slim = {key: data[key] for key in ("doc_id", "file_type") if key in data}
+        
+        profile = self._get_doc_profile(data)
+        if not isinstance(profile, dict):
+            slim["doc_profile"] = profile
+            return slim
+        
+        slim_profile: Dict[str, Any] = {}
+        for _, parts in self._PARSED_TAGS:
+            head = parts[0]
+            if head not in profile:
+                continue
+            value = profile[head]
+            if len(parts) == 1 or not isinstance(value, dict):
+                slim_profile[head] = value
+            elif parts[1] in value:
+                slim_profile.setdefault(head, {})[parts[1]] = value[parts[1]]
+            else:
+                slim_profile.setdefault(head, {})
+        slim["doc_profile"] = slim_profile
+        return slim
+    
+    def _get_nested_value_parts(self, data: Dict, parts: Tuple[str, ...]) -> Any:
+        """按预先拆分的路径分段获取嵌套字典中的值"""
+        # 标签路径多为 1~2 级，直接展开，避免通用循环
+        if len(parts) == 1:
+            return data.get(parts[0]) if isinstance(data, dict) else None
+        if len(parts) == 2:
+            value = data.get(parts[0]) if isinstance(data, dict) else None
+            return value.get(parts[1]) if isinstance(value, dict) else None
+        
         value = data
-        for k in keys:
+        for k in parts:
             if isinstance(value, dict):
                 value = value.get(k)
             else:
                 return None
         return value
     
+    def _get_flat_profile(self, annotation: Dict) -> Dict[str, Any]:
+        """获取扁平化的标签值 {标签: 值}（结果缓存在标注的 _flat_profile 字段）"""
+        flat = annotation.get("_flat_profile")
+        if flat is None:
+            profile = self._get_doc_profile(annotation)
+            flat = {
+                tag: self._get_nested_value_parts(profile, parts)
+                for tag, parts in self._PARSED_TAGS
+            }
+            annotation["_flat_profile"] = flat
+        return flat
+    
     def _get_doc_profile(self, annotation: Dict) -> Dict:
         """获取 doc_profile（兼容旧版 pdf_profile）"""
         return annotation.get("doc_profile") or annotation.get("pdf_profile") or {}
     
-    def _get_stressors(self, annotation: Dict) -> List[str]:
-        """提取文档的压力点列表"""
-        profile = self._get_doc_profile(annotation)
-        stressors = []
+    def _get_stressor_mask(self, annotation: Dict) -> int:
+        """
+        提取文档的压力点位掩码（结果缓存在标注的 _stressor_mask 字段，全量/分文件夹分析复用）
         
-        for tag in self.STRESSOR_TAGS:
-            value = self._get_nested_value(profile, tag)
-            if value is True:
-                stressors.append(tag)
+        第 i 位对应 _STRESSOR_BITS[i]，压力点数即置位数，组合可直接用整数作键。
+        """
+        mask = annotation.get("_stressor_mask")
+        if mask is not None:
+            return mask
+        
+        flat = self._get_flat_profile(annotation)
+        mask = 0
+        for bit, tag in enumerate(self.STRESSOR_TAGS):
+            if flat[tag] is True:
+                mask |= 1 << bit
         
         # 特殊处理 layout
-        layout = profile.get("layout")
+        layout = flat["layout"]
         if layout in ("double", "mixed"):
-            stressors.append(f"layout={layout}")
+            mask |= 1 << self._STRESSOR_BIT_INDEX[f"layout={layout}"]
         
-        return stressors
+        annotation["_stressor_mask"] = mask
+        return mask
+    
+    def _decode_stressor_mask(self, mask: int) -> List[str]:
+        """将压力点位掩码还原为压力点列表（顺序与 _STRESSOR_BITS 一致）"""
+        return [name for bit, name in enumerate(self._STRESSOR_BITS) if mask >> bit & 1]
+    
+    def _tag_columns(self, flats: List[Dict[str, Any]]) -> Dict[str, List[Optional[bool]]]:
+        """
+        按列提取所有标签值（列式布局）
+        
+        每个标签对应一列，非布尔值统一归为 None，便于直接在列上做计数。
+        """
+        columns = {}
+        for tag, _ in self._PARSED_TAGS:
+            column = []
+            append = column.append
+            for flat in flats:
+                value = flat[tag]
+                append(value if value is True or value is False else None)
+            columns[tag] = column
+        return columns
+    
+    def _compute_primary_counters(self, data: List[Dict]) -> PrimaryCounters:
+        """单次遍历标注列表，同时累计各分析方法所需的计数"""
+        counters = PrimaryCounters(total=len(data))
+        file_types = counters.file_type_counter
+        folders = counters.folder_counter
+        layouts = counters.layout_counter
+        masks = counters.stressor_mask_counter
+        doc_masks = counters.doc_masks
+        ft_by_id = counters.ft_by_id
+        flats = []
+        
+        for ann in data:
+            file_types[ann.get("file_type", "unknown")] += 1
+            folders[ann.get("_folder", "_unknown")] += 1
+            layouts[self._get_doc_profile(ann).get("layout", "unknown")] += 1
+            flats.append(self._get_flat_profile(ann))
+            
+            # 同一 doc_id 以首次出现的文档为准
+            doc_id = ann.get("doc_id")
+            if doc_id not in ft_by_id:
+                ft_by_id[doc_id] = ann.get("file_type")
+            
+            mask = self._get_stressor_mask(ann)
+            doc_masks.append((ann.get("doc_id", "unknown"), mask))
+            masks[mask] += 1
+        
+        # 压力点计数分布和组合统计只需按不同的掩码（至多 2^len(_STRESSOR_BITS) 种）汇总，
+        # 不必逐文档计算；组合与顺序无关，直接用位掩码作键
+        for mask, count in masks.items():
+            counters.stressor_count_counter[mask.bit_count()] += count
+            if mask:
+                counters.stressor_combo_counter[mask] = count
+        
+        # 列中只含 True/False/None，list.count 在 C 层完成计数
+        for tag, column in self._tag_columns(flats).items():
+            true_count = column.count(True)
+            false_count = column.count(False)
+            counters.tag_counts[tag] = (true_count, false_count, len(column) - true_count - false_count)
+        
+        return counters
+    
+    @cached_property
+    def primary_counters(self) -> PrimaryCounters:
+        """全量标注的基础计数"""
+        return self._compute_primary_counters(self.annotations)
+    
+    def _counters_for(self, data: List[Dict]) -> PrimaryCounters:
+        """获取指定标注列表的基础计数（全量数据复用缓存）"""
+        if data is self.annotations:
+            return self.primary_counters
+        return self._compute_primary_counters(data)
     
     # ==================== 分析方法 ====================
     
@@ -129,20 +400,21 @@ class AnnotationAnalyzer:
         if not data:
             return {"total_files": 0, "file_types": {}, "folders": {}}
         
-        # 文件类型分布
-        file_types = Counter(a.get("file_type", "unknown") for a in data)
-        
-        # 文件夹分布
-        folders = Counter(a.get("_folder", "_unknown") for a in data)
+        return self._build_basic_stats(self._counters_for(data))
+    
+    def _build_basic_stats(self, counters: PrimaryCounters) -> Dict:
+        """根据基础计数生成基础统计"""
+        total = counters.total
+        file_types = counters.file_type_counter
         
         return {
-            "total_files": len(data),
+            "total_files": total,
             "file_types": dict(file_types.most_common()),
             "file_type_rates": {
-                k: f"{v / len(data) * 100:.1f}%"
+                k: f"{v / total * 100:.1f}%"
                 for k, v in file_types.items()
             },
-            "folders": dict(folders.most_common()),
+            "folders": dict(counters.folder_counter.most_common()),
         }
     
     def analyze_tag_distribution(self, annotations: List[Dict] = None) -> Dict:
@@ -152,25 +424,13 @@ class AnnotationAnalyzer:
         if not data:
             return {}
         
+        return self._build_tag_distribution(self._counters_for(data))
+    
+    def _build_tag_distribution(self, counters: PrimaryCounters) -> Dict:
+        """根据基础计数生成标签分布"""
         result = {}
-        all_tags = self.COMMON_TAGS + self.PDF_ONLY_TAGS
         
-        for tag in all_tags:
-            true_count = 0
-            false_count = 0
-            na_count = 0
-            
-            for ann in data:
-                profile = self._get_doc_profile(ann)
-                value = self._get_nested_value(profile, tag)
-                
-                if value is True:
-                    true_count += 1
-                elif value is False:
-                    false_count += 1
-                else:
-                    na_count += 1
-            
+        for tag, (true_count, false_count, na_count) in counters.tag_counts.items():
             total_valid = true_count + false_count
             result[tag] = {
                 "true": true_count,
@@ -180,13 +440,7 @@ class AnnotationAnalyzer:
             }
         
         # 特殊处理 layout 枚举
-        layout_dist = Counter()
-        for ann in data:
-            profile = self._get_doc_profile(ann)
-            layout = profile.get("layout", "unknown")
-            layout_dist[layout] += 1
-        
-        result["layout_distribution"] = dict(layout_dist.most_common())
+        result["layout_distribution"] = dict(counters.layout_counter.most_common())
         
         return result
     
@@ -197,46 +451,49 @@ class AnnotationAnalyzer:
         if not data:
             return {}
         
-        # 每个文档的压力点
-        doc_stressors: List[Tuple[str, List[str]]] = []
-        for ann in data:
-            stressors = self._get_stressors(ann)
-            doc_stressors.append((ann.get("doc_id", "unknown"), stressors))
-        
-        # 压力点计数分布
-        count_dist = Counter(len(s) for _, s in doc_stressors)
-        
-        # 组合统计
-        combo_counter = Counter()
-        for _, stressors in doc_stressors:
-            if stressors:
-                combo_key = tuple(sorted(stressors))
-                combo_counter[combo_key] += 1
-        
-        # 常见组合 TOP 20
+        return self._build_stressor_combinations(self._counters_for(data))
+    
+    def _build_stressor_combinations(self, counters: PrimaryCounters) -> Dict:
+        """根据基础计数生成压力点组合分析"""
+        doc_masks = counters.doc_masks
+        count_dist = counters.stressor_count_counter
+        combo_counter = counters.stressor_combo_counter
+        ft_by_id = counters.ft_by_id
+        decode = self._decode_stressor_mask
+        
+        # 常见组合 TOP 20（仅对输出的组合还原为标签名）
         top_combos = [
-            {"stressors": list(combo), "count": count}
-            for combo, count in combo_counter.most_common(20)
+            {"stressors": sorted(decode(mask)), "count": count}
+            for mask, count in combo_counter.most_common(20)
         ]
         
-        # 稀有组合（仅出现 1-2 次）
-        rare_combos = [
-            {"stressors": list(combo), "count": count}
-            for combo, count in combo_counter.items()
+        # 稀有组合（仅出现 1-2 次，最多显示 20 个）
+        rare_masks = [
+            (mask, count)
+            for mask, count in combo_counter.items()
             if count <= 2
         ]
-        
-        # 高复杂度文档（压力点 >= threshold）
-        high_complexity_docs = [
-            {
-                "doc_id": doc_id,
-                "file_type": next((a.get("file_type") for a in data if a.get("doc_id") == doc_id), "unknown"),
-                "stressors": stressors,
-                "stressor_count": len(stressors),
-            }
-            for doc_id, stressors in doc_stressors
-            if len(stressors) >= self.complexity_threshold
+        rare_combos = [
+            {"stressors": sorted(decode(mask)), "count": count}
+            for mask, count in rare_masks[:20]
         ]
+        
+        # 高复杂度文档（压力点 >= threshold），每种掩码只判定和还原一次
+        high_masks = {
+            mask: decode(mask)
+            for mask in counters.stressor_mask_counter
+            if mask.bit_count() >= self.complexity_threshold
+        }
+        high_complexity_docs = []
+        for doc_id, mask in doc_masks:
+            stressors = high_masks.get(mask)
+            if stressors is not None:
+                high_complexity_docs.append({
+                    "doc_id": doc_id,
+                    "file_type": ft_by_id.get(doc_id, "unknown"),
+                    "stressors": list(stressors),
+                    "stressor_count": len(stressors),
+                })
         high_complexity_docs.sort(key=lambda x: x["stressor_count"], reverse=True)
         
         return {
@@ -245,7 +502,7 @@ class AnnotationAnalyzer:
             },
             "total_unique_combinations": len(combo_counter),
             "top_combinations": top_combos,
-            "rare_combinations": rare_combos[:20],  # 最多显示 20 个
+            "rare_combinations": rare_combos,
             "high_complexity_docs": high_complexity_docs,
             "high_complexity_count": len(high_complexity_docs),
         }
@@ -321,9 +578,13 @@ class AnnotationAnalyzer:
         if not data:
             return {}
         
-        tag_dist = self.analyze_tag_distribution(data)
-        bucket_analysis = self.analyze_buckets(data)
-        
+        return self._build_gaps(
+            self._counters_for(data),
+            self.analyze_buckets(data),
+        )
+    
+    def _build_gaps(self, counters: PrimaryCounters, bucket_analysis: Dict) -> Dict:
+        """根据基础计数中的标签计数和已计算的分桶结果生成覆盖缺口"""
         gaps = {
             "empty_buckets": [],
             "sparse_buckets": [],
@@ -331,14 +592,15 @@ class AnnotationAnalyzer:
             "file_type_gaps": [],
         }
         
-        # 检查完全缺失的特征
-        for tag, dist in tag_dist.items():
-            if isinstance(dist, dict) and "true" in dist:
-                if dist["true"] == 0:
-                    gaps["missing_features"].append({
-                        "tag": tag,
-                        "message": f"标签 '{tag}' 在所有文档中都为 false",
-                    })
+        # 检查完全缺失的特征（直接读取基础计数中的 true 计数）
+        gaps["missing_features"] = [
+            {
+                "tag": tag,
+                "message": f"标签 '{tag}' 在所有文档中都为 false",
+            }
+            for tag, (true_count, _, _) in counters.tag_counts.items()
+            if true_count == 0
+        ]
         
         # 检查文件类型缺口
         expected_types = {"pdf", "doc", "ppt", "xlsx"}
@@ -379,11 +641,14 @@ class AnnotationAnalyzer:
         if not data:
             return {}
         
-        basic_stats = self.analyze_basic_stats(data)
-        bucket_analysis = self.analyze_buckets(data)
-        gaps = self.analyze_gaps(data)
-        stressor_analysis = self.analyze_stressor_combinations(data)
-        
+        return self._build_sampling_advice(
+            self.analyze_basic_stats(data),
+            self.analyze_gaps(data),
+            self.analyze_stressor_combinations(data),
+        )
+    
+    def _build_sampling_advice(self, basic_stats: Dict, gaps: Dict, stressor_analysis: Dict) -> Dict:
+        """根据已计算的基础统计、覆盖缺口和压力点组合生成采样建议"""
         # 计算各文件类型的最小数量
         file_type_counts = basic_stats.get("file_types", {})
         min_count = min(file_type_counts.values()) if file_type_counts else 0
@@ -416,126 +681,219 @@ class AnnotationAnalyzer:
         
         return advice
     
+    # ==================== 全量分析结果（按需计算并缓存） ====================
+    
+    # 各分项的缓存属性名（接入新数据时需要清空）
+    _CACHED_SECTIONS = (
+        "primary_counters",
+        "basic_stats",
+        "tag_distribution",
+        "stressor_combinations",
+        "buckets",
+        "gaps",
+        "sampling_advice",
+    )
+    
+    @cached_property
+    def basic_stats(self) -> Dict:
+        """全量基础统计"""
+        return self.analyze_basic_stats()
+    
+    @cached_property
+    def tag_distribution(self) -> Dict:
+        """全量标签分布"""
+        return self.analyze_tag_distribution()
+    
+    @cached_property
+    def stressor_combinations(self) -> Dict:
+        """全量压力点组合"""
+        return self.analyze_stressor_combinations()
+    
+    @cached_property
+    def buckets(self) -> Dict:
+        """全量分桶结果"""
+        return self.analyze_buckets()
+    
+    @cached_property
+    def gaps(self) -> Dict:
+        """全量覆盖缺口（复用已缓存的基础计数和分桶结果）"""
+        if not self.annotations:
+            return {}
+        return self._build_gaps(self.primary_counters, self.buckets)
+    
+    @cached_property
+    def sampling_advice(self) -> Dict:
+        """全量采样建议（复用已缓存的基础统计、覆盖缺口和压力点组合）"""
+        if not self.annotations:
+            return {}
+        return self._build_sampling_advice(self.basic_stats, self.gaps, self.stressor_combinations)
+    
+    def _invalidate_cache(self):
+        """清空完整分析结果及各分项缓存"""
+        self._full_analysis = None
+        for name in self._CACHED_SECTIONS:
+            self.__dict__.pop(name, None)
+    
     # ==================== 输出方法 ====================
     
     def run_full_analysis(self) -> Dict:
-        """运行完整分析"""
-        return {
+        """运行完整分析（结果会被缓存，重复调用不会重新计算）"""
+        if self._full_analysis is not None:
+            return self._full_analysis
+        
+        self._full_analysis = {
             "metadata": {
                 "generated_at": datetime.now().isoformat(),
                 "input_dir": str(self.input_dir),
                 "sparse_threshold": self.sparse_threshold,
                 "complexity_threshold": self.complexity_threshold,
             },
-            "basic_stats": self.analyze_basic_stats(),
-            "tag_distribution": self.analyze_tag_distribution(),
-            "stressor_combinations": self.analyze_stressor_combinations(),
-            "buckets": self.analyze_buckets(),
-            "gaps": self.analyze_gaps(),
-            "sampling_advice": self.generate_sampling_advice(),
+            "basic_stats": self.basic_stats,
+            "tag_distribution": self.tag_distribution,
+            "stressor_combinations": self.stressor_combinations,
+            "buckets": self.buckets,
+            "gaps": self.gaps,
+            "sampling_advice": self.sampling_advice,
         }
+        return self._full_analysis
     
     def run_folder_analysis(self) -> Dict:
         """按文件夹运行分析"""
         result = {}
         for folder, annotations in self.by_folder.items():
+            # 每个文件夹只遍历一次，三项分析共用同一份计数
+            counters = self._compute_primary_counters(annotations)
             result[folder] = {
-                "basic_stats": self.analyze_basic_stats(annotations),
-                "tag_distribution": self.analyze_tag_distribution(annotations),
-                "stressor_combinations": self.analyze_stressor_combinations(annotations),
+                "basic_stats": self._build_basic_stats(counters),
+                "tag_distribution": self._build_tag_distribution(counters),
+                "stressor_combinations": self._build_stressor_combinations(counters),
             }
         return result
     
-    def export_to_json(self, output_dir: str):
-        """导出所有 JSON 报告"""
+    def export_to_json(
+        self,
+        output_dir: str,
+        full_analysis: Optional[Dict] = None,
+        compact: bool = False,
+        gzip_level: Optional[int] = None,
+    ):
+        """
+        导出所有 JSON 报告（可传入已计算的完整分析结果）
+        
+        Args:
+            output_dir: 输出目录
+            full_analysis: 可选，已计算的完整分析结果
+            compact: 大文件（summary/by_folder/buckets/stressor_combos）使用紧凑格式
+            gzip_level: 可选，大文件改为写出 .json.gz 并使用该压缩级别（1 最快）
+        """
         out_path = Path(output_dir)
         out_path.mkdir(parents=True, exist_ok=True)
         
-        full_analysis = self.run_full_analysis()
+        full_analysis = full_analysis or self.run_full_analysis()
+        
+        def write_large(name: str, obj: Any):
+            content = _json_dumps(obj, compact=compact)
+            if gzip_level is not None:
+                with gzip.open(out_path / f"{name}.gz", "wb", compresslevel=gzip_level) as f:
+                    f.write(content)
+            else:
+                with open(out_path / name, "wb") as f:
+                    f.write(content)
         
         # summary.json
-        with open(out_path / "summary.json", "w", encoding="utf-8") as f:
-            json.dump(full_analysis, f, ensure_ascii=False, indent=2)
+        write_large("summary.json", full_analysis)
         
         # by_folder.json
-        folder_analysis = self.run_folder_analysis()
-        with open(out_path / "by_folder.json", "w", encoding="utf-8") as f:
-            json.dump(folder_analysis, f, ensure_ascii=False, indent=2)
+        write_large("by_folder.json", self.run_folder_analysis())
         
         # buckets.json
-        with open(out_path / "buckets.json", "w", encoding="utf-8") as f:
-            json.dump(full_analysis["buckets"], f, ensure_ascii=False, indent=2)
+        write_large("buckets.json", full_analysis["buckets"])
         
         # stressor_combos.json
-        with open(out_path / "stressor_combos.json", "w", encoding="utf-8") as f:
-            json.dump(full_analysis["stressor_combinations"], f, ensure_ascii=False, indent=2)
+        write_large("stressor_combos.json", full_analysis["stressor_combinations"])
         
-        # gaps.json
-        with open(out_path / "gaps.json", "w", encoding="utf-8") as f:
-            json.dump(full_analysis["gaps"], f, ensure_ascii=False, indent=2)
+        # gaps.json（小文件，始终保持缩进格式便于阅读）
+        with open(out_path / "gaps.json", "wb") as f:
+            f.write(_json_dumps(full_analysis["gaps"]))
         
         # sampling_advice.json
-        with open(out_path / "sampling_advice.json", "w", encoding="utf-8") as f:
-            json.dump(full_analysis["sampling_advice"], f, ensure_ascii=False, indent=2)
+        with open(out_path / "sampling_advice.json", "wb") as f:
+            f.write(_json_dumps(full_analysis["sampling_advice"]))
         
         return full_analysis
     
-    def export_to_csv(self, output_dir: str):
-        """导出 CSV 报告"""
+    @staticmethod
+    def _write_csv(path: Path, rows: List[List[Any]]):
+        """一次性写出所有 CSV 行（带 BOM 便于 Excel 打开，使用 64 KiB 缓冲）"""
+        with open(path, "w", encoding="utf-8-sig", newline="", buffering=CSV_BUFFER_SIZE) as f:
+            csv.writer(f).writerows(rows)
+    
+    def export_to_csv(self, output_dir: str, full_analysis: Optional[Dict] = None):
+        """导出 CSV 报告（可传入已计算的完整分析结果）"""
         out_path = Path(output_dir)
         out_path.mkdir(parents=True, exist_ok=True)
         
-        full_analysis = self.run_full_analysis()
+        # CSV 只需要标签分布、分桶和压力点组合，未传入完整结果时无需计算缺口和采样建议
+        if full_analysis:
+            tag_dist = full_analysis["tag_distribution"]
+            buckets = full_analysis["buckets"]
+            stressor_combos = full_analysis["stressor_combinations"]
+        else:
+            tag_dist = self.tag_distribution
+            buckets = self.buckets
+            stressor_combos = self.stressor_combinations
         
         # tag_distribution.csv
-        tag_dist = full_analysis["tag_distribution"]
-        with open(out_path / "tag_distribution.csv", "w", encoding="utf-8-sig", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["标签", "true", "false", "N/A", "true占比"])
-            for tag, dist in tag_dist.items():
-                if isinstance(dist, dict) and "true" in dist:
-                    writer.writerow([
-                        tag,
-                        dist.get("true", 0),
-                        dist.get("false", 0),
-                        dist.get("na", 0),
-                        dist.get("true_rate", "N/A"),
-                    ])
+        rows = [["标签", "true", "false", "N/A", "true占比"]]
+        rows.extend(
+            [
+                tag,
+                dist.get("true", 0),
+                dist.get("false", 0),
+                dist.get("na", 0),
+                dist.get("true_rate", "N/A"),
+            ]
+            for tag, dist in tag_dist.items()
+            if isinstance(dist, dict) and "true" in dist
+        )
+        self._write_csv(out_path / "tag_distribution.csv", rows)
         
         # bucket_distribution.csv
-        buckets = full_analysis["buckets"]
-        with open(out_path / "bucket_distribution.csv", "w", encoding="utf-8-sig", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["桶类型", "桶名称", "文件数"])
-            
-            # 一级桶
-            for ft, info in buckets.get("level1_buckets", {}).items():
-                writer.writerow(["file_type", ft, info["count"]])
-            
-            # 二级桶（PDF）
-            for bucket_key, info in buckets.get("level2_buckets", {}).get("pdf", {}).items():
-                writer.writerow(["pdf_sub", bucket_key, info["count"]])
+        rows = [["桶类型", "桶名称", "文件数"]]
+        
+        # 一级桶
+        rows.extend(
+            ["file_type", ft, info["count"]]
+            for ft, info in buckets.get("level1_buckets", {}).items()
+        )
+        
+        # 二级桶（PDF）
+        rows.extend(
+            ["pdf_sub", bucket_key, info["count"]]
+            for bucket_key, info in buckets.get("level2_buckets", {}).get("pdf", {}).items()
+        )
+        self._write_csv(out_path / "bucket_distribution.csv", rows)
         
         # high_complexity_docs.csv
-        stressor_combos = full_analysis["stressor_combinations"]
         high_docs = stressor_combos.get("high_complexity_docs", [])
-        with open(out_path / "high_complexity_docs.csv", "w", encoding="utf-8-sig", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["doc_id", "file_type", "压力点数", "压力点列表"])
-            for doc in high_docs:
-                writer.writerow([
-                    doc["doc_id"],
-                    doc["file_type"],
-                    doc["stressor_count"],
-                    ", ".join(doc["stressors"]),
-                ])
-    
-    def export_to_markdown(self, output_dir: str) -> str:
-        """导出 Markdown 报告"""
+        rows = [["doc_id", "file_type", "压力点数", "压力点列表"]]
+        rows.extend(
+            [
+                doc["doc_id"],
+                doc["file_type"],
+                doc["stressor_count"],
+                ", ".join(doc["stressors"]),
+            ]
+            for doc in high_docs
+        )
+        self._write_csv(out_path / "high_complexity_docs.csv", rows)
+    
+    def export_to_markdown(self, output_dir: str, full_analysis: Optional[Dict] = None) -> str:
+        """导出 Markdown 报告（可传入已计算的完整分析结果）"""
         out_path = Path(output_dir)
         out_path.mkdir(parents=True, exist_ok=True)
         
-        full_analysis = self.run_full_analysis()
+        full_analysis = full_analysis or self.run_full_analysis()
         basic = full_analysis["basic_stats"]
         tag_dist = full_analysis["tag_distribution"]
         stressor_combos = full_analysis["stressor_combinations"]
@@ -712,7 +1070,7 @@ class AnnotationAnalyzer:
         
         report_content = "\n".join(lines)
         
-        with open(out_path / "REPORT.md", "w", encoding="utf-8") as f:
+        with open(out_path / "REPORT.md", "w", encoding="utf-8", buffering=MARKDOWN_BUFFER_SIZE) as f:
             f.write(report_content)
         
         return report_content
@@ -721,13 +1079,16 @@ class AnnotationAnalyzer:
         """导出所有格式的报告"""
         print(f"正在分析 {len(self.annotations)} 个标注文件...")
         
-        self.export_to_json(output_dir)
+        # 完整分析只计算一次，三种格式共用
+        full_analysis = self.run_full_analysis()
+        
+        self.export_to_json(output_dir, full_analysis)
         print("  [OK] JSON 报告已生成")
         
-        self.export_to_csv(output_dir)
+        self.export_to_csv(output_dir, full_analysis)
         print("  [OK] CSV 报告已生成")
         
-        self.export_to_markdown(output_dir)
+        self.export_to_markdown(output_dir, full_analysis)
         print("  [OK] Markdown 报告已生成")
         
         print(f"\n所有报告已输出到: {output_dir}")
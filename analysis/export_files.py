@@ -7,20 +7,45 @@
 用法:
     uv run python analysis/export_files.py
     uv run python analysis/export_files.py --input docs_annotation/output --output analysis/reports/files.csv
+    uv run python analysis/export_files.py --workers 8
 """
 
 import argparse
 import csv
-import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
+# 以脚本方式运行时，将项目根目录加入模块搜索路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analysis.analyzer import _iter_json_files, _json_loads
+
+
+def load_json(json_file: Path):
+    """以二进制方式读取并解析 JSON 文件（解析函数与分析器共用）"""
+    with open(json_file, "rb") as f:
+        return _json_loads(f.read())
+
 
 def get_nested_value(data: dict, key: str):
     """获取嵌套字典中的值，支持点号分隔的路径"""
-    keys = key.split(".")
+    return get_nested_value_parts(data, key.split("."))
+
+
+def get_nested_value_parts(data: dict, parts):
+    """按预先拆分的路径分段获取嵌套字典中的值"""
+    # 标签路径多为 1~2 级，直接展开，避免通用循环
+    if len(parts) == 1:
+        return data.get(parts[0]) if isinstance(data, dict) else None
+    if len(parts) == 2:
+        value = data.get(parts[0]) if isinstance(data, dict) else None
+        return value.get(parts[1]) if isinstance(value, dict) else None
+    
     value = data
-    for k in keys:
+    for k in parts:
         if isinstance(value, dict):
             value = value.get(k)
         else:
@@ -28,6 +53,59 @@ def get_nested_value(data: dict, key: str):
     return value
 
 
+# CSV 列定义
+COLUMNS = [
+    "folder",
+    "doc_id",
+    "file_type",
+    "file_path",
+    "layout",
+    "has_image",
+    "has_table",
+    "has_formula",
+    "has_chart",
+    "image_text_mixed",
+    "reading_order_sensitive",
+    "table_profile.long_table",
+    "table_profile.cross_page_table",
+    "table_profile.table_dominant",
+    "chart_profile.cross_page_chart",
+]
+
+# profile 字段列（跳过前4个基础字段）及预先拆分的路径分段
+PROFILE_COLUMNS = [(col, tuple(col.split("."))) for col in COLUMNS[4:]]
+
+# 并行解析时每个任务批次包含的文件数（摊薄进程间序列化开销）
+PARSE_CHUNKSIZE = 64
+
+# 写出 CSV 时的缓冲区大小（64 KiB）
+CSV_BUFFER_SIZE = 64 * 1024
+
+
+def _parse_one(json_file: Path, input_path: Path):
+    """解析单个标注文件为一行 CSV 数据（按 COLUMNS 顺序的列表），返回 (路径, 行, 错误信息)（模块级函数，便于多进程调用）"""
+    try:
+        data = load_json(json_file)
+    except (ValueError, IOError) as e:  # 覆盖各解析库的 JSONDecodeError 及 UnicodeDecodeError
+        return json_file, None, str(e)
+    
+    profile = data.get("doc_profile") or data.get("pdf_profile") or {}
+    
+    row = [
+        json_file.parent.name if json_file.parent != input_path else "_root",
+        data.get("doc_id", ""),
+        data.get("file_type", ""),
+        data.get("file_path", ""),
+    ]
+    
+    # 提取 profile 中的字段
+    for _, parts in PROFILE_COLUMNS:
+        value = get_nested_value_parts(profile, parts)
+        row.append(value if value is not None else "")
+    
+    return json_file, row, None
+
+
 def main():
     parser = argparse.ArgumentParser(description="导出文件级别的标注数据到 CSV")
     parser.add_argument(
@@ -42,6 +120,12 @@ def main():
         default="analysis/reports/files.csv",
         help="输出 CSV 文件路径 (默认: analysis/reports/files.csv)",
     )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="并行解析 JSON 的进程数 (默认: CPU 核数，1 表示不启用多进程)",
+    )
     
     args = parser.parse_args()
     
@@ -53,65 +137,35 @@ def main():
         sys.exit(1)
     
     # 收集所有 JSON 文件
-    json_files = list(input_path.rglob("*.json"))
+    json_files = sorted(Path(p) for p in _iter_json_files(str(input_path)))
     if not json_files:
         print(f"错误: 目录中没有 JSON 文件: {input_path}")
         sys.exit(1)
     
     print(f"找到 {len(json_files)} 个 JSON 文件")
     
-    # CSV 列定义
-    columns = [
-        "folder",
-        "doc_id",
-        "file_type",
-        "file_path",
-        "layout",
-        "has_image",
-        "has_table",
-        "has_formula",
-        "has_chart",
-        "image_text_mixed",
-        "reading_order_sensitive",
-        "table_profile.long_table",
-        "table_profile.cross_page_table",
-        "table_profile.table_dominant",
-        "chart_profile.cross_page_chart",
-    ]
+    # 收集数据（文件数较多时多进程并行解析）
+    parse = partial(_parse_one, input_path=input_path)
+    if args.workers > 1 and len(json_files) > PARSE_CHUNKSIZE:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = list(executor.map(parse, json_files, chunksize=PARSE_CHUNKSIZE))
+    else:
+        results = list(map(parse, json_files))
     
-    # 收集数据
     rows = []
-    for json_file in sorted(json_files):
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            profile = data.get("doc_profile") or data.get("pdf_profile") or {}
-            
-            row = {
-                "folder": json_file.parent.name if json_file.parent != input_path else "_root",
-                "doc_id": data.get("doc_id", ""),
-                "file_type": data.get("file_type", ""),
-                "file_path": data.get("file_path", ""),
-            }
-            
-            # 提取 profile 中的字段
-            for col in columns[4:]:  # 跳过前4个基础字段
-                value = get_nested_value(profile, col)
-                row[col] = value if value is not None else ""
-            
+    for json_file, row, error in results:
+        if error is not None:
+            print(f"警告: 无法加载 {json_file}: {error}")
+        else:
             rows.append(row)
-            
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"警告: 无法加载 {json_file}: {e}")
     
     # 确保输出目录存在
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     # 写入 CSV
-    with open(output_path, "w", encoding="utf-8-sig", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=columns)
-        writer.writeheader()
+    with open(output_path, "w", encoding="utf-8-sig", newline="", buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
         writer.writerows(rows)
     
     print(f"已导出 {len(rows)} 条记录到: {output_path}")
@@ -8,6 +8,8 @@
     python batch_annotate.py --input ../reference/data/Files --output ./output
     python batch_annotate.py --use-mock  # 使用Mock模型测试
     python batch_annotate.py --parser legacy  # 使用轻量级解析器（不需要Docling/GPU）
+    python batch_annotate.py --workers 1  # 顺序处理（默认 16 个线程并发）
+    python batch_annotate.py --executor process  # CPU 密集（如本地 PaddleOCR）时使用进程池
 """
 
 import sys
@@ -24,20 +26,249 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import json
+import sqlite3
 import argparse
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Set, Dict, Any
-from datetime import datetime
+from typing import List, Set, Dict, Any, Optional
+import time
 
 from src.service import AnnotationService
 from src.processors.doc_parser import ParserBackend
 from src.models.ocr import PaddleOCRModel, MockOCR
-from src.models.llm import OpenAILLM, MockLLM
+from src.models.llm import OpenAILLM, MockLLM, BatchingLLM, CachedLLM, RoutingLLM
 from src.core.logger import get_logger
 
+# 更快的 JSON 序列化（可选依赖，未安装时使用标准库 json）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 进度条（可选依赖，未安装时使用内置的简易进度条）
+try:
+    from tqdm.auto import tqdm
+except ImportError:
+    tqdm = None
+
 
 # 支持的文件扩展名
-SUPPORTED_EXTENSIONS = {'.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx'}
+SUPPORTED_EXTENSIONS = frozenset({'.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx'})
+
+# 各输入目录中记录解析失败文件的清单文件名
+FAILED_LIST_NAME = "parsing_failed_files.json"
+
+# 详细模式下每累计多少行输出一次
+VERBOSE_FLUSH_EVERY = 32
+
+# 失败文件清单的解析结果缓存（位于输出目录下）
+FAILED_CACHE_PATH = Path(".cache") / "failed_files.sqlite"
+
+# 顺序/流水线模式下后台保存结果的线程数，以及最多积压的待保存结果数
+SAVE_WORKERS = 3
+MAX_PENDING_SAVES = 32
+
+# 简易进度条的长度和最短刷新间隔（纳秒）
+PROGRESS_BAR_LEN = 30
+PROGRESS_REFRESH_NS = 100_000_000
+
+# 默认的 LLM 响应缓存目录
+DEFAULT_LLM_CACHE_DIR = Path(__file__).parent / "llm_cache"
+
+
+def _iter_files(root: Path):
+    """
+    递归遍历目录下的所有文件，产出 os.DirEntry。
+
+    每个目录只 scandir 一次，遍历顺序与 Path.rglob("*") 相同。
+    """
+    def list_dir(path) -> list:
+        try:
+            with os.scandir(path) as it:
+                return list(it)
+        except OSError:
+            return []
+
+    entries = list_dir(root)
+    for entry in entries:
+        if entry.is_file():
+            yield entry
+
+    stack = [entries]
+    while stack:
+        for entry in stack.pop():
+            if entry.is_dir(follow_symlinks=False):
+                children = list_dir(entry.path)
+                for child in children:
+                    if child.is_file():
+                        yield child
+                stack.append(children)
+
+
+def _accepts_name(name: str, failed_files: Set[str]) -> bool:
+    """
+    只根据文件名判断：不在失败列表中且扩展名受支持。
+
+    直接切分文件名字符串，不构造 Path 对象。
+    """
+    # 检查文件名是否在失败列表中
+    if name in failed_files:
+        return False
+
+    # 检查扩展名（与 Path.suffix 一致：以点开头的隐藏文件名没有扩展名）
+    dot = name.rfind(".")
+    return dot > 0 and name[dot:].lower() in SUPPORTED_EXTENSIONS
+
+
+def create_service(
+    use_mock: bool,
+    parser_backend: ParserBackend = ParserBackend.AUTO,
+    quiet: bool = False,
+    llm_batch_size: int = 0,
+    llm_cache_dir: Optional[Path] = None,
+    llm_semantic_threshold: Optional[float] = None,
+    llm_max_connections: Optional[int] = None,
+    ocr_device: Optional[str] = None,
+    llm_fast_model: Optional[str] = None,
+    llm_min_confidence: float = 0.7,
+) -> AnnotationService:
+    """
+    根据配置创建标注服务。
+
+    Args:
+        use_mock: 是否使用Mock模型（用于测试）
+        parser_backend: 解析器后端（AUTO/DOCLING/LEGACY）
+        quiet: 是否静默（进程池工作进程中避免重复打印初始化信息）
+        llm_batch_size: > 1 时将并发的 LLM 请求合并为微批（仅用于真实 LLM）
+        llm_cache_dir: 可选，LLM 响应磁盘缓存目录（仅用于真实 LLM）
+        llm_semantic_threshold: 可选，语义缓存相似度阈值（需同时启用缓存目录）
+        llm_max_connections: 可选，OpenAI 客户端连接池大小（通常为并发线程数）
+        ocr_device: 可选，PaddleOCR 运行设备（如 "gpu:0"）
+        llm_fast_model: 可选，低成本模型名称；设置后先用它标注，结果不可靠时再用标准模型
+        llm_min_confidence: 模型路由时低成本模型分类结果的最低置信度
+
+    Returns:
+        标注服务实例
+    """
+    log = (lambda *args, **kwargs: None) if quiet else print
+
+    if use_mock:
+        log("使用 Mock 模型进行测试...")
+        return AnnotationService(
+            ocr_model=MockOCR(),
+            llm_model=MockLLM(),
+            parser_backend=parser_backend,
+        )
+
+    # 使用真实模型
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    openai_base_url = os.getenv("OPENAI_BASE_URL")
+    openai_model = os.getenv("OPENAI_MODEL_STANDARD", "gpt-4")
+
+    if not openai_api_key:
+        log("警告: 未设置 OPENAI_API_KEY，将使用 Mock LLM")
+        log("请在 .env 文件中配置或设置环境变量")
+        llm_model = MockLLM()
+    else:
+        llm_kwargs = {
+            "api_key": openai_api_key,
+            "model": openai_model,
+        }
+        if openai_base_url:
+            llm_kwargs["base_url"] = openai_base_url
+            log(f"使用自定义 OpenAI Base URL: {openai_base_url}")
+        if llm_max_connections:
+            llm_kwargs["max_connections"] = llm_max_connections
+
+        llm_model = OpenAILLM(**llm_kwargs)
+        log(f"使用 OpenAI 模型: {openai_model}")
+
+        if llm_fast_model and llm_fast_model != openai_model:
+            llm_model = RoutingLLM(
+                OpenAILLM(**{**llm_kwargs, "model": llm_fast_model}),
+                llm_model,
+                min_confidence=llm_min_confidence,
+            )
+            log(f"LLM 模型路由: 优先 {llm_fast_model}，置信度 < {llm_min_confidence} 或字段缺失时使用 {openai_model}")
+
+        if llm_batch_size > 1:
+            llm_model = BatchingLLM(llm_model, batch_size=llm_batch_size)
+            log(f"LLM 请求微批合并: 每批最多 {llm_batch_size} 个")
+
+        # 缓存放在最外层：命中时无需进入微批队列等待
+        if llm_cache_dir is not None:
+            llm_model = CachedLLM(
+                llm_model,
+                str(llm_cache_dir),
+                semantic_threshold=llm_semantic_threshold,
+            )
+            log(f"LLM 响应缓存目录: {llm_cache_dir}")
+            if llm_semantic_threshold is not None:
+                log(f"LLM 语义缓存: 相似度阈值 {llm_semantic_threshold}")
+
+    try:
+        ocr_model = PaddleOCRModel(lang="ch", device=ocr_device)
+        log("使用 PaddleOCR + OpenAI 进行标注...")
+    except ImportError:
+        log("警告: PaddleOCR 未安装，将使用 Mock OCR")
+        ocr_model = MockOCR()
+
+    return AnnotationService(
+        ocr_model=ocr_model,
+        llm_model=llm_model,
+        parser_backend=parser_backend,
+    )
+
+
+# 进程池工作进程内的标注服务（每个进程初始化一次）
+_worker_service: Optional[AnnotationService] = None
+
+
+def _init_worker(
+    use_mock: bool,
+    parser_backend: ParserBackend,
+    llm_cache_dir: Optional[Path] = None,
+    llm_semantic_threshold: Optional[float] = None,
+    device_queue=None,
+    llm_fast_model: Optional[str] = None,
+    llm_min_confidence: float = 0.7,
+) -> None:
+    """
+    进程池初始化函数：在工作进程中创建标注服务。
+
+    每个工作进程只加载一次模型；指定了设备时从 device_queue 领取一个设备。
+    """
+    global _worker_service
+    device = device_queue.get() if device_queue is not None else None
+    _worker_service = create_service(
+        use_mock,
+        parser_backend,
+        quiet=True,
+        llm_cache_dir=llm_cache_dir,
+        llm_semantic_threshold=llm_semantic_threshold,
+        ocr_device=device,
+        llm_fast_model=llm_fast_model,
+        llm_min_confidence=llm_min_confidence,
+    )
+
+
+def _annotate_in_worker(file_path: str, output_path: str) -> Optional[str]:
+    """
+    在工作进程中标注并保存单个文件。
+
+    Returns:
+        成功返回 None，失败返回错误信息
+    """
+    try:
+        annotation = _worker_service.annotate(file_path)
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        _worker_service.save_annotation(annotation, output_path)
+        return None
+    except Exception as e:
+        return str(e)
 
 
 class BatchAnnotator:
@@ -50,6 +281,14 @@ class BatchAnnotator:
         use_mock: bool = False,
         skip_existing: bool = True,
         parser_backend: ParserBackend = ParserBackend.AUTO,
+        workers: int = 1,
+        executor: str = "thread",
+        llm_batch_size: int = 0,
+        llm_cache_dir: Optional[Path] = None,
+        llm_semantic_threshold: Optional[float] = None,
+        devices: Optional[List[str]] = None,
+        llm_fast_model: Optional[str] = None,
+        llm_min_confidence: float = 0.7,
     ):
         """
         初始化批量标注器。
@@ -60,53 +299,52 @@ class BatchAnnotator:
             use_mock: 是否使用Mock模型（用于测试）
             skip_existing: 是否跳过已标注的文件
             parser_backend: 解析器后端（AUTO/DOCLING/LEGACY）
+            workers: 并发处理的文件数（<= 1 时顺序处理）
+            executor: 并发方式，"thread"（I/O 密集，如调用 LLM API）、
+                      "process"（CPU 密集，如本地 PaddleOCR）或
+                      "pipeline"（解析/OCR/LLM 三阶段流水线，忽略 workers）
+            llm_batch_size: 线程池并发时将 LLM 请求合并为微批的批大小（<= 1 不合并）
+            llm_cache_dir: 可选，LLM 响应磁盘缓存目录（None 表示不缓存）
+            llm_semantic_threshold: 可选，语义缓存相似度阈值（None 表示只做精确匹配）
+            devices: 可选，OCR 运行设备列表（如 ["gpu:0", "gpu:1"]）；进程池模式下
+                     工作进程轮流分配设备，其他模式使用第一个设备
+            llm_fast_model: 可选，模型路由时优先使用的低成本模型名称
+            llm_min_confidence: 模型路由时低成本模型分类结果的最低置信度
         """
         self.input_dir = input_dir
         self.output_dir = output_dir
         self.skip_existing = skip_existing
         self.parser_backend = parser_backend
 
-        # 初始化服务
-        if use_mock:
-            print("使用 Mock 模型进行测试...")
-            self.service = AnnotationService(
-                ocr_model=MockOCR(),
-                llm_model=MockLLM(),
-                parser_backend=parser_backend,
-            )
+        self.use_mock = use_mock
+        self.workers = workers
+        self.executor = executor
+
+        # 初始化服务（只有线程池并发时才有多个 LLM 请求可合并）
+        if executor != "thread" or workers <= 1:
+            llm_batch_size = 0
+        self.llm_cache_dir = llm_cache_dir
+        self.llm_semantic_threshold = llm_semantic_threshold
+        self.devices = devices or []
+        self.llm_fast_model = llm_fast_model
+        self.llm_min_confidence = llm_min_confidence
+
+        # 进程池并发时模型只在工作进程中加载，主进程不再额外加载一份
+        self.service: Optional[AnnotationService] = None
+        if executor == "process" and workers > 1:
+            print(f"进程池模式: {workers} 个工作进程各自加载一次模型")
         else:
-            # 使用真实模型
-            openai_api_key = os.getenv("OPENAI_API_KEY")
-            openai_base_url = os.getenv("OPENAI_BASE_URL")
-            openai_model = os.getenv("OPENAI_MODEL_STANDARD", "gpt-4")
-            
-            if not openai_api_key:
-                print("警告: 未设置 OPENAI_API_KEY，将使用 Mock LLM")
-                print("请在 .env 文件中配置或设置环境变量")
-                llm_model = MockLLM()
-            else:
-                llm_kwargs = {
-                    "api_key": openai_api_key,
-                    "model": openai_model,
-                }
-                if openai_base_url:
-                    llm_kwargs["base_url"] = openai_base_url
-                    print(f"使用自定义 OpenAI Base URL: {openai_base_url}")
-                
-                llm_model = OpenAILLM(**llm_kwargs)
-                print(f"使用 OpenAI 模型: {openai_model}")
-
-            try:
-                ocr_model = PaddleOCRModel(lang="ch")
-                print("使用 PaddleOCR + OpenAI 进行标注...")
-            except ImportError:
-                print("警告: PaddleOCR 未安装，将使用 Mock OCR")
-                ocr_model = MockOCR()
-
-            self.service = AnnotationService(
-                ocr_model=ocr_model,
-                llm_model=llm_model,
-                parser_backend=parser_backend,
+            self.service = create_service(
+                use_mock,
+                parser_backend,
+                llm_batch_size=llm_batch_size,
+                llm_cache_dir=llm_cache_dir,
+                llm_semantic_threshold=llm_semantic_threshold,
+                # 线程池中所有线程共享一个客户端，连接池按并发数放大
+                llm_max_connections=workers if executor == "thread" and workers > 1 else None,
+                ocr_device=self.devices[0] if self.devices else None,
+                llm_fast_model=llm_fast_model,
+                llm_min_confidence=llm_min_confidence,
             )
 
         # 统计信息
@@ -118,53 +356,142 @@ class BatchAnnotator:
             "success": 0,
         }
         self.failed_files: List[Dict[str, str]] = []
+        # 并发处理时保护 stats / failed_files
+        self._lock = threading.Lock()
+        # 顺序/流水线模式下保存结果的常驻线程池（所有文件共用，run 结束时关闭）
+        self._save_pool = ThreadPoolExecutor(max_workers=SAVE_WORKERS, thread_name_prefix="ann-save")
 
-    def load_failed_files(self) -> Set[str]:
+    def load_failed_files(self, list_files: Optional[List[str]] = None) -> Set[str]:
         """
         加载所有 parsing_failed_files.json 中的文件名。
 
+        Args:
+            list_files: 可选，已找到的清单文件路径；不提供时遍历输入目录查找
+
         Returns:
             失败文件名集合
         """
         failed_files = set()
 
-        for json_file in self.input_dir.rglob("parsing_failed_files.json"):
+        if list_files is None:
+            list_files = [
+                entry.path
+                for entry in _iter_files(self.input_dir)
+                if entry.name == FAILED_LIST_NAME
+            ]
+
+        # 清单文件均未变化（路径、修改时间、大小相同）时直接使用上次的解析结果
+        signature = self._failed_lists_signature(list_files)
+        cached = self._load_failed_cache(signature) if signature else None
+        if cached is not None:
+            return cached
+
+        all_loaded = True
+        for json_file in list_files:
             try:
                 with open(json_file, "r", encoding="utf-8") as f:
                     data = json.load(f)
                     failed_files.update(data.get("parsing_failed_files", []))
             except Exception as e:
+                all_loaded = False
                 print(f"警告: 读取失败文件列表时出错 {json_file}: {e}")
 
+        # 有清单读取失败时不缓存，下次运行仍会重新读取并提示
+        if signature and all_loaded:
+            self._store_failed_cache(signature, failed_files)
+
         return failed_files
 
-    def should_process(self, file_path: Path, failed_files: Set[str]) -> bool:
+    @staticmethod
+    def _failed_lists_signature(list_files: List[str]) -> Optional[str]:
+        """根据清单文件的路径、修改时间和大小计算签名，无清单或无法读取时返回None。"""
+        if not list_files:
+            return None
+        try:
+            stamps = []
+            for path in sorted(list_files):
+                st = os.stat(path)
+                stamps.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            return None
+        return json.dumps(stamps, ensure_ascii=False)
+
+    def _load_failed_cache(self, signature: str) -> Optional[Set[str]]:
+        """读取失败文件缓存，签名不一致或缓存不可用时返回None。"""
+        cache_path = self.output_dir / FAILED_CACHE_PATH
+        if not cache_path.is_file():
+            return None
+        try:
+            with sqlite3.connect(str(cache_path)) as conn:
+                row = conn.execute("SELECT signature FROM meta").fetchone()
+                if row is None or row[0] != signature:
+                    return None
+                return {name for (name,) in conn.execute("SELECT name FROM failed")}
+        except sqlite3.Error:
+            return None
+
+    def _store_failed_cache(self, signature: str, failed_files: Set[str]) -> None:
+        """写入失败文件缓存（写入失败不影响标注流程）。"""
+        cache_path = self.output_dir / FAILED_CACHE_PATH
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with sqlite3.connect(str(cache_path)) as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (signature TEXT)")
+                conn.execute("CREATE TABLE IF NOT EXISTS failed (name TEXT)")
+                conn.execute("DELETE FROM meta")
+                conn.execute("DELETE FROM failed")
+                conn.executemany("INSERT INTO failed (name) VALUES (?)", ((n,) for n in failed_files))
+                conn.execute("INSERT INTO meta (signature) VALUES (?)", (signature,))
+        except (OSError, sqlite3.Error):
+            pass
+
+    def should_process(
+        self,
+        file_path: Path,
+        failed_files: Set[str],
+        existing_outputs: Optional[Set[str]] = None,
+    ) -> bool:
         """
         判断文件是否应该被处理。
 
         Args:
             file_path: 文件路径
             failed_files: 失败文件名集合
+            existing_outputs: 可选，已存在的输出文件路径集合（由 scan_existing_outputs
+                预先扫描）；不提供时逐个检查输出文件是否存在
 
         Returns:
             是否应该处理
         """
-        # 检查文件名是否在失败列表中
-        if file_path.name in failed_files:
-            return False
-
-        # 检查扩展名
-        if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+        if not _accepts_name(file_path.name, failed_files):
             return False
 
         # 检查是否已经标注（如果启用跳过）
-        if self.skip_existing:
-            output_file = self.get_output_path(file_path)
-            if output_file.exists():
-                return False
+        if self.skip_existing and self._has_output(file_path, existing_outputs):
+            return False
 
         return True
 
+    def _has_output(self, file_path: Path, existing_outputs: Optional[Set[str]]) -> bool:
+        """判断文件是否已有标注结果。"""
+        output_file = self.get_output_path(file_path)
+        if existing_outputs is not None:
+            return str(output_file) in existing_outputs
+        return output_file.exists()
+
+    def scan_existing_outputs(self) -> Set[str]:
+        """
+        一次遍历输出目录，收集已存在的标注结果路径。
+
+        Returns:
+            已存在的 .json 输出文件路径集合
+        """
+        return {
+            entry.path
+            for entry in _iter_files(self.output_dir)
+            if entry.name.endswith(".json")
+        }
+
     def get_output_path(self, input_file: Path) -> Path:
         """
         获取输出文件路径（保持原有目录结构）。
@@ -192,20 +519,30 @@ class BatchAnnotator:
         """
         print(f"\n扫描目录: {self.input_dir}")
 
-        failed_files = self.load_failed_files()
+        # 输入目录只遍历一次：失败清单和待处理文件都从同一份列表中取
+        entries = list(_iter_files(self.input_dir))
+
+        failed_files = self.load_failed_files(
+            [entry.path for entry in entries if entry.name == FAILED_LIST_NAME]
+        )
         if failed_files:
             print(f"已加载 {len(failed_files)} 个失败文件（将被跳过）")
 
+        existing_outputs = self.scan_existing_outputs() if self.skip_existing else None
+
+        self.stats["total_files"] += len(entries)
         files_to_process = []
 
-        for file_path in self.input_dir.rglob("*"):
-            if not file_path.is_file():
+        for entry in entries:
+            # 先用文件名过滤，只为候选文件构造 Path
+            if not _accepts_name(entry.name, failed_files):
                 continue
 
-            self.stats["total_files"] += 1
+            file_path = Path(entry.path)
+            if self.skip_existing and self._has_output(file_path, existing_outputs):
+                continue
 
-            if self.should_process(file_path, failed_files):
-                files_to_process.append(file_path)
+            files_to_process.append(file_path)
 
         print(f"\n找到 {self.stats['total_files']} 个文件")
         print(f"需要处理 {len(files_to_process)} 个文件")
@@ -232,17 +569,144 @@ class BatchAnnotator:
 
             self.service.save_annotation(annotation, str(output_path))
 
-            self.stats["success"] += 1
+            self._record_result(file_path, None)
             return True
 
         except Exception as e:
+            self._record_result(file_path, str(e))
+            return False
+
+    def _save(self, file_path: Path, annotation) -> Optional[str]:
+        """
+        保存标注结果。
+
+        Returns:
+            失败时的错误信息，成功为 None
+        """
+        try:
+            output_path = self.get_output_path(file_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self.service.save_annotation(annotation, str(output_path))
+        except Exception as e:
+            return str(e)
+        return None
+
+    def _annotate_inline(self, files: List[Path]):
+        """在当前线程中逐个标注，产出 (文件路径, 标注结果, 错误信息)。"""
+        for file_path in files:
+            try:
+                yield file_path, self.service.annotate(str(file_path)), None
+            except Exception as e:
+                yield file_path, None, str(e)
+
+    def _save_in_background(self, annotated):
+        """
+        主线程继续标注下一个文件，保存交给常驻线程池；按输入顺序返回结果。
+
+        Args:
+            annotated: (文件路径, 标注结果, 错误信息) 迭代器
+        """
+        pending = deque()
+
+        def finish():
+            file_path, outcome = pending.popleft()
+            error = outcome.result() if isinstance(outcome, Future) else outcome
+            self._record_result(file_path, error)
+            return file_path, error is None
+
+        for file_path, annotation, error in annotated:
+            if error is None:
+                pending.append((file_path, self._save_pool.submit(self._save, file_path, annotation)))
+            else:
+                pending.append((file_path, error))
+
+            # 已完成的结果按顺序取出；积压过多时等待最早的保存完成
+            while pending and (
+                len(pending) > MAX_PENDING_SAVES
+                or not isinstance(pending[0][1], Future)
+                or pending[0][1].done()
+            ):
+                yield finish()
+
+        while pending:
+            yield finish()
+
+    def _record_result(self, file_path: Path, error: Optional[str]) -> None:
+        """
+        记录单个文件的处理结果（线程安全）。
+
+        Args:
+            file_path: 文件路径
+            error: 失败时的错误信息，成功为 None
+        """
+        with self._lock:
+            if error is None:
+                self.stats["success"] += 1
+                return
             self.stats["failed"] += 1
             self.failed_files.append({
                 "file": str(file_path),
-                "error": str(e),
+                "error": error,
             })
-            print(f"  ✗ 失败: {e}")
-            return False
+        print(f"  ✗ 失败: {error}")
+
+    def _iter_results(self, files: List[Path]):
+        """
+        处理所有文件，按完成顺序逐个返回 (文件路径, 是否成功)。
+
+        Args:
+            files: 待处理文件列表
+        """
+        if self.executor == "pipeline":
+            # 三阶段流水线：解析 → OCR → LLM 各由一个线程执行，结果按输入顺序返回
+            paths = {str(f): f for f in files}
+            yield from self._save_in_background(
+                (paths[path], annotation, error)
+                for path, annotation, error in self.service.annotate_stream(paths)
+            )
+            return
+
+        if self.workers <= 1:
+            # 顺序处理：主线程负责标注，保存在后台进行
+            yield from self._save_in_background(self._annotate_inline(files))
+            return
+
+        if self.executor == "process":
+            # 进程池：每个工作进程独立创建标注服务，结果回到主进程统一记录
+            device_queue = None
+            if self.devices:
+                device_queue = multiprocessing.Queue()
+                for i in range(self.workers):
+                    device_queue.put(self.devices[i % len(self.devices)])
+
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(
+                    self.use_mock,
+                    self.parser_backend,
+                    self.llm_cache_dir,
+                    self.llm_semantic_threshold,
+                    device_queue,
+                    self.llm_fast_model,
+                    self.llm_min_confidence,
+                ),
+            ) as pool:
+                futures = {
+                    pool.submit(_annotate_in_worker, str(f), str(self.get_output_path(f))): f
+                    for f in files
+                }
+                for future in as_completed(futures):
+                    file_path = futures[future]
+                    error = future.result()
+                    self._record_result(file_path, error)
+                    yield file_path, error is None
+        else:
+            # 线程池：共享同一个标注服务，适合以 LLM/OCR 接口等待为主的场景
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(self.process_file, f): f for f in files}
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
 
     def run(self, verbose: bool = False):
         """
@@ -251,7 +715,7 @@ class BatchAnnotator:
         Args:
             verbose: 是否显示每个文件的处理详情（默认 False，只显示进度）
         """
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
 
         print("=" * 60)
         print("文档批量标注系统")
@@ -268,38 +732,70 @@ class BatchAnnotator:
         total = len(files)
         print(f"\n开始处理 {total} 个文件...")
 
-        for i, file_path in enumerate(files, 1):
-            self.process_file(file_path)
+        pending_lines: List[str] = []
+        pbar = None
+        if not verbose and tqdm is not None:
+            pbar = tqdm(total=total, desc="进度", mininterval=0.2)
+
+        # 简易进度条：预先生成满格/空格字符串，每次只切片拼接
+        full_bar = "█" * PROGRESS_BAR_LEN
+        empty_bar = "░" * PROGRESS_BAR_LEN
+        pct_scale = 100 / total
+        last_render_ns = 0
+
+        for i, (file_path, ok) in enumerate(self._iter_results(files), 1):
             self.stats["processed"] += 1
 
             # 进度显示
             if verbose:
-                # 详细模式：每个文件一行
+                # 详细模式：每个文件一行，攒够一批再统一输出
                 relative_path = file_path.relative_to(self.input_dir)
-                status = "✓" if self.stats["success"] == i - self.stats["failed"] else "✗"
-                print(f"[{i}/{total}] {status} {relative_path}")
+                status = "✓" if ok else "✗"
+                pending_lines.append(f"[{i}/{total}] {status} {relative_path}")
+                if len(pending_lines) >= VERBOSE_FLUSH_EVERY:
+                    print("\n".join(pending_lines))
+                    pending_lines.clear()
+            elif pbar is not None:
+                pbar.update(1)
             else:
-                # 简洁模式：同一行更新进度
-                progress = i / total * 100
-                bar_len = 30
-                filled = int(bar_len * i / total)
-                bar = "█" * filled + "░" * (bar_len - filled)
-                print(f"\r进度: {bar} {progress:5.1f}% ({i}/{total})", end="", flush=True)
-
-        # 换行（简洁模式下进度条结束）
-        if not verbose:
+                # 简洁模式：同一行更新进度，最多每 100ms 刷新一次（最后一个文件总是刷新）
+                now_ns = time.monotonic_ns()
+                if i == total or now_ns - last_render_ns >= PROGRESS_REFRESH_NS:
+                    last_render_ns = now_ns
+                    filled = PROGRESS_BAR_LEN * i // total
+                    bar = full_bar[:filled] + empty_bar[filled:]
+                    print(f"\r进度: {bar} {i * pct_scale:5.1f}% ({i}/{total})", end="", flush=True)
+
+        # 所有结果都已保存，关闭常驻的保存线程池
+        self._save_pool.shutdown(wait=True)
+
+        # 并发完成顺序不确定，失败列表按输入顺序排列
+        order = {str(f): idx for idx, f in enumerate(files)}
+        self.failed_files.sort(key=lambda item: order.get(item["file"], len(order)))
+
+        # 输出剩余的详细行 / 结束进度条
+        if pending_lines:
+            print("\n".join(pending_lines))
+        if pbar is not None:
+            pbar.close()
+        elif not verbose:
             print()
 
         # 保存失败文件报告
         if self.failed_files:
             report_path = self.output_dir / "failed_files.json"
             report_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(report_path, "w", encoding="utf-8") as f:
-                json.dump(self.failed_files, f, indent=2, ensure_ascii=False)
+            # 先整体序列化再一次写入，避免 json.dump 逐块写入
+            if orjson is not None:
+                report_path.write_bytes(orjson.dumps(self.failed_files, option=orjson.OPT_INDENT_2))
+            else:
+                report_path.write_text(
+                    json.dumps(self.failed_files, indent=2, ensure_ascii=False),
+                    encoding="utf-8",
+                )
 
         # 打印统计
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = (time.monotonic_ns() - start_ns) / 1e9
 
         print("\n" + "=" * 60)
         print("处理完成！")
@@ -361,6 +857,70 @@ def main():
         help="解析器类型: auto, docling, legacy（默认: auto）",
     )
 
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=16,
+        help="并发处理的文件数（默认: 16，1 表示顺序处理）",
+    )
+
+    parser.add_argument(
+        "--executor",
+        choices=["thread", "process", "pipeline"],
+        default="thread",
+        help="并发方式: thread（I/O 密集，默认）、process（CPU 密集，如本地 PaddleOCR）"
+             "或 pipeline（解析 → OCR → LLM 三阶段流水线）",
+    )
+
+    parser.add_argument(
+        "--devices",
+        type=str,
+        default=None,
+        help="OCR 运行设备，逗号分隔（如 gpu:0,gpu:1）；进程池模式下工作进程轮流分配",
+    )
+
+    parser.add_argument(
+        "--llm-batch-size",
+        type=int,
+        default=16,
+        help="线程池并发时合并 LLM 请求的批大小（默认: 16，0 表示不合并）",
+    )
+
+    parser.add_argument(
+        "--llm-fast-model",
+        type=str,
+        default=os.getenv("OPENAI_MODEL_FAST"),
+        help="低成本模型名称（如 gpt-4o-mini，默认读取 OPENAI_MODEL_FAST）；"
+             "设置后先用它标注，结果不可靠时再用标准模型",
+    )
+
+    parser.add_argument(
+        "--llm-min-confidence",
+        type=float,
+        default=0.7,
+        help="模型路由时低成本模型分类结果的最低置信度（默认: 0.7）",
+    )
+
+    parser.add_argument(
+        "--llm-cache-dir",
+        type=str,
+        default=str(DEFAULT_LLM_CACHE_DIR),
+        help="LLM 响应磁盘缓存目录（默认: docs_annotation/llm_cache）",
+    )
+
+    parser.add_argument(
+        "--llm-semantic-threshold",
+        type=float,
+        default=None,
+        help="启用 LLM 语义缓存的余弦相似度阈值，如 0.92（需要 sentence-transformers）",
+    )
+
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="不使用 LLM 响应缓存",
+    )
+
     parser.add_argument(
         "--log-to-file",
         action="store_true",
@@ -400,6 +960,14 @@ def main():
         use_mock=args.use_mock,
         skip_existing=not args.no_skip_existing,
         parser_backend=parser_backend,
+        workers=args.workers,
+        executor=args.executor,
+        devices=[d.strip() for d in args.devices.split(",") if d.strip()] if args.devices else None,
+        llm_batch_size=args.llm_batch_size,
+        llm_cache_dir=None if args.no_llm_cache else Path(args.llm_cache_dir).resolve(),
+        llm_semantic_threshold=args.llm_semantic_threshold,
+        llm_fast_model=args.llm_fast_model,
+        llm_min_confidence=args.llm_min_confidence,
     )
 
     annotator.run(verbose=args.verbose)
@@ -5,11 +5,13 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessResult:
     """
     统一格式的处理结果。
 
+    使用 __slots__：每个处理步骤都会创建一个结果对象，省去实例 __dict__。
+
     Attributes:
         success: 处理是否成功
         data: 处理后的数据
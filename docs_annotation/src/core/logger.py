@@ -7,6 +7,10 @@ from datetime import datetime
 from typing import Optional
 
 
+# 文件开始/结束时的分隔线
+_SEPARATOR = "=" * 60
+
+
 class AnnotationLogger:
     """
     文档标注系统统一日志器。
@@ -97,27 +101,35 @@ class AnnotationLogger:
     
     def file_start(self, file_path: str, file_type: str) -> None:
         """记录开始处理文件。"""
-        self.logger.info(f"{'='*60}")
-        self.logger.info(f"[FILE] 开始处理: {file_path}")
-        self.logger.info(f"   文件类型: {file_type}")
+        logger = self.logger
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(_SEPARATOR)
+        logger.info("[FILE] 开始处理: %s", file_path)
+        logger.info("   文件类型: %s", file_type)
     
     def file_end(self, file_path: str, success: bool, duration_ms: Optional[float] = None) -> None:
         """记录文件处理完成。"""
+        logger = self.logger
+        if not logger.isEnabledFor(logging.INFO):
+            return
         status = "[OK]" if success else "[FAIL]"
-        duration_str = f" ({duration_ms:.0f}ms)" if duration_ms else ""
-        self.logger.info(f"{status} 处理完成: {file_path}{duration_str}")
-        self.logger.info(f"{'='*60}")
+        if duration_ms:
+            logger.info("%s 处理完成: %s (%.0fms)", status, file_path, duration_ms)
+        else:
+            logger.info("%s 处理完成: %s", status, file_path)
+        logger.info(_SEPARATOR)
     
     # === 解析器日志 ===
     
     def parser_start(self, parser_name: str) -> None:
         """记录解析器开始。"""
-        self.logger.info(f"[PARSER] 使用解析器: {parser_name}")
+        self.logger.info("[PARSER] 使用解析器: %s", parser_name)
     
     def parser_fallback(self, from_parser: str, to_parser: str, reason: str) -> None:
         """记录解析器回退。"""
-        self.logger.warning(f"[WARN] 解析器回退: {from_parser} -> {to_parser}")
-        self.logger.warning(f"   原因: {reason}")
+        self.logger.warning("[WARN] 解析器回退: %s -> %s", from_parser, to_parser)
+        self.logger.warning("   原因: %s", reason)
     
     # === 元素检测日志 ===
     
@@ -132,40 +144,56 @@ class AnnotationLogger:
         image_pages: list = None
     ) -> None:
         """记录检测到的元素。"""
-        self.logger.info(f"[RESULT] 解析结果:")
-        self.logger.info(f"   页数: {page_count}")
-        self.logger.info(f"   图片: {images} 个" + (f" (页: {image_pages})" if image_pages else ""))
-        self.logger.info(f"   表格: {tables} 个" + (f" (页: {table_pages})" if table_pages else ""))
-        self.logger.info(f"   公式: {formulas} 个")
-        self.logger.info(f"   图表: {charts} 个")
+        logger = self.logger
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info("[RESULT] 解析结果:")
+        logger.info("   页数: %s", page_count)
+        if image_pages:
+            logger.info("   图片: %s 个 (页: %s)", images, image_pages)
+        else:
+            logger.info("   图片: %s 个", images)
+        if table_pages:
+            logger.info("   表格: %s 个 (页: %s)", tables, table_pages)
+        else:
+            logger.info("   表格: %s 个", tables)
+        logger.info("   公式: %s 个", formulas)
+        logger.info("   图表: %s 个", charts)
     
     def table_info(self, table_idx: int, page: int, rows: int = 0, cols: int = 0, bbox: list = None) -> None:
         """记录表格详细信息。"""
-        bbox_str = f", bbox={bbox}" if bbox else ""
-        self.logger.debug(f"   表格[{table_idx}]: 页{page}, {rows}行x{cols}列{bbox_str}")
+        if bbox:
+            self.logger.debug("   表格[%s]: 页%s, %s行x%s列, bbox=%s", table_idx, page, rows, cols, bbox)
+        else:
+            self.logger.debug("   表格[%s]: 页%s, %s行x%s列", table_idx, page, rows, cols)
     
     # === OCR 日志 ===
     
     def ocr_start(self, page_idx: int, image_size: tuple = None) -> None:
         """记录 OCR 开始。"""
-        size_str = f" ({image_size[0]}x{image_size[1]})" if image_size else ""
-        self.logger.debug(f"[OCR] 处理页 {page_idx}{size_str}")
+        if image_size:
+            self.logger.debug("[OCR] 处理页 %s (%sx%s)", page_idx, image_size[0], image_size[1])
+        else:
+            self.logger.debug("[OCR] 处理页 %s", page_idx)
     
     def ocr_result(self, page_idx: int, detected: dict) -> None:
         """记录 OCR 结果。"""
+        # 摘要只在 DEBUG 级别开启时才拼接
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         summary = ", ".join([
             f"{k}={len(v)}" for k, v in detected.items() if v
         ])
         if summary:
-            self.logger.debug(f"   OCR 页{page_idx} 结果: {summary}")
+            self.logger.debug("   OCR 页%s 结果: %s", page_idx, summary)
     
     def ocr_error(self, page_idx: int, error: str) -> None:
         """记录 OCR 错误。"""
-        self.logger.error(f"[ERROR] OCR 页{page_idx} 失败: {error}")
+        self.logger.error("[ERROR] OCR 页%s 失败: %s", page_idx, error)
     
     def ocr_skip(self, reason: str) -> None:
         """记录跳过 OCR 的原因。"""
-        self.logger.debug(f"[SKIP] 跳过 OCR: {reason}")
+        self.logger.debug("[SKIP] 跳过 OCR: %s", reason)
     
     # === 特征提取日志 ===
     
@@ -178,19 +206,26 @@ class AnnotationLogger:
         table_page_ratio: float = 0.0
     ) -> None:
         """记录提取的特征。"""
-        self.logger.info(f"[FEATURE] 特征提取:")
+        logger = self.logger
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info("[FEATURE] 特征提取:")
         if table_dominant is not None:
-            self.logger.info(f"   表格主导: {table_dominant} (表格页占比: {table_page_ratio:.1%})")
-        self.logger.info(f"   跨页表格: {cross_page_table}")
-        self.logger.info(f"   长表格: {long_table}")
-        self.logger.info(f"   跨页图表: {cross_page_chart}")
+            logger.info(
+                "   表格主导: %s (表格页占比: %.1f%%)", table_dominant, table_page_ratio * 100
+            )
+        logger.info("   跨页表格: %s", cross_page_table)
+        logger.info("   长表格: %s", long_table)
+        logger.info("   跨页图表: %s", cross_page_chart)
     
     # === 布局分类日志 ===
     
     def layout_classified(self, layout: str, reason: str = "") -> None:
         """记录布局分类结果。"""
-        reason_str = f" ({reason})" if reason else ""
-        self.logger.info(f"[LAYOUT] 布局类型: {layout}{reason_str}")
+        if reason:
+            self.logger.info("[LAYOUT] 布局类型: %s (%s)", layout, reason)
+        else:
+            self.logger.info("[LAYOUT] 布局类型: %s", layout)
     
     # === 通用日志 ===
     
@@ -204,11 +239,11 @@ class AnnotationLogger:
     
     def warning(self, msg: str) -> None:
         """警告日志。"""
-        self.logger.warning(f"[WARN] {msg}")
+        self.logger.warning("[WARN] %s", msg)
     
     def error(self, msg: str) -> None:
         """错误日志。"""
-        self.logger.error(f"[ERROR] {msg}")
+        self.logger.error("[ERROR] %s", msg)
 
 
 # 全局日志实例
@@ -1,9 +1,20 @@
 """处理管道 - 顺序连接多个处理器。"""
 
-from typing import Any, List, Optional
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
 from .base import BaseProcessor, ProcessResult
 
 
+# 分阶段执行时表示输入结束的哨兵
+_STOP = object()
+
+# 分阶段执行时线程检查停止信号的间隔（秒）
+_POLL_INTERVAL = 0.1
+
+
 class Pipeline:
     """
     处理管道 - 按顺序执行处理器。
@@ -81,10 +92,25 @@ class Pipeline:
         Returns:
             包含最终处理后数据的ProcessResult
         """
+        return self._execute_steps(input_data, 0, len(self.steps))
+
+    def _execute_steps(self, input_data: Any, start: int, stop: int) -> ProcessResult:
+        """
+        执行 steps[start:stop] 范围内的处理器。
+
+        Args:
+            input_data: 要处理的输入数据
+            start: 起始处理器索引
+            stop: 结束处理器索引（不含）
+
+        Returns:
+            包含处理后数据的ProcessResult
+        """
         current_data = input_data
-        all_errors: List[str] = []
+        steps = self.steps
 
-        for i, processor in enumerate(self.steps):
+        for i in range(start, stop):
+            processor = steps[i]
             try:
                 result = processor.process(current_data)
 
@@ -99,31 +125,144 @@ class Pipeline:
                 current_data = result.data
 
             except Exception as e:
-                all_errors.append(f"Exception in {processor.__class__.__name__}: {str(e)}")
+                # 错误列表只在失败时创建，成功路径不做额外分配
                 return ProcessResult(
                     success=False,
                     data=current_data,
-                    errors=all_errors,
+                    errors=[f"Exception in {processor.__class__.__name__}: {str(e)}"],
                     metadata={"failed_at_step": i, "processor": processor.__class__.__name__},
                 )
 
         return ProcessResult(
             success=True,
             data=current_data,
-            metadata={"steps_executed": len(self.steps)},
+            metadata={"steps_executed": stop},
         )
 
-    def execute_batch(self, inputs: List[Any]) -> List[ProcessResult]:
+    def execute_staged(
+        self,
+        inputs: Iterable[Any],
+        boundaries: Sequence[int],
+        queue_size: int = 32,
+    ) -> Iterator[Tuple[Any, ProcessResult]]:
+        """
+        分阶段流水线执行。
+
+        按 boundaries 将处理器切分为多个阶段，每个阶段由一个线程执行，
+        阶段之间通过有界队列衔接，使不同输入的各阶段（如解析、OCR、LLM）相互重叠。
+        某个阶段失败的输入直接透传到末尾，不再执行后续阶段。
+        调用方提前关闭生成器时，各阶段线程在下一次检查停止信号时退出。
+
+        Args:
+            inputs: 输入数据迭代器（在独立线程中消费）
+            boundaries: 阶段切分点（处理器索引），如 (1, 2) 表示 [0] | [1] | [2:]
+            queue_size: 阶段间队列的最大长度
+
+        Yields:
+            (原始输入, ProcessResult)，按输入顺序返回
+
+        Raises:
+            输入迭代器抛出的异常，在已读入的输入全部返回后重新抛出
+        """
+        cuts = [0, *sorted(b for b in set(boundaries) if 0 < b < len(self.steps)), len(self.steps)]
+        stages = list(zip(cuts, cuts[1:]))
+        # queues[i] 为第 i 个阶段的输入队列，最后一个为输出队列
+        queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+        # 调用方提前放弃生成器时置位，阻塞在队列上的线程据此退出
+        stop = threading.Event()
+        feed_errors: List[BaseException] = []
+
+        def put(q: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: queue.Queue) -> Any:
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+            return _STOP
+
+        def feed():
+            # 输入迭代器抛出异常时也要放入哨兵，异常交给调用方重新抛出
+            try:
+                for item in inputs:
+                    if not put(queues[0], (item, ProcessResult(success=True, data=item))):
+                        return
+            except BaseException as e:
+                feed_errors.append(e)
+            finally:
+                put(queues[0], _STOP)
+
+        def run_stage(idx: int, start: int, stop_idx: int):
+            in_q, out_q = queues[idx], queues[idx + 1]
+            while True:
+                item = get(in_q)
+                if item is _STOP:
+                    put(out_q, _STOP)
+                    return
+                original, result = item
+                if result.success:
+                    result = self._execute_steps(result.data, start, stop_idx)
+                if not put(out_q, (original, result)):
+                    return
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        threads += [
+            threading.Thread(target=run_stage, args=(idx, start, stop_idx), daemon=True)
+            for idx, (start, stop_idx) in enumerate(stages)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _STOP:
+                    break
+                yield item
+        finally:
+            # 正常结束时各线程已退出；生成器被提前关闭时通知各线程停止
+            stop.set()
+
+        for thread in threads:
+            thread.join()
+        if feed_errors:
+            raise feed_errors[0]
+
+    def execute_batch(self, inputs: List[Any], max_workers: int = 1) -> List[ProcessResult]:
         """
         批量执行管道。
 
+        默认顺序执行。max_workers > 1 时使用线程池并发执行，同一组处理器实例
+        会被多个线程同时调用，仅适用于线程安全的处理器（本仓库的解析器不满足，
+        AnnotationService 为每个线程各建一个 Pipeline）。
+        每个结果的 metadata["elapsed"] 记录该输入的处理耗时（秒）。
+
         Args:
             inputs: 输入数据列表
+            max_workers: 最大并发数（默认 1，即顺序执行）
 
         Returns:
-            ProcessResult对象列表
+            ProcessResult对象列表，顺序与输入一致
         """
-        return [self.execute(input_data) for input_data in inputs]
+        def timed_execute(input_data: Any) -> ProcessResult:
+            start = time.perf_counter()
+            result = self.execute(input_data)
+            result.metadata["elapsed"] = time.perf_counter() - start
+            return result
+
+        if max_workers <= 1 or len(inputs) <= 1:
+            return [timed_execute(input_data) for input_data in inputs]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(inputs))) as pool:
+            return list(pool.map(timed_execute, inputs))
 
     def __len__(self) -> int:
         """返回管道中的步骤数量。"""
@@ -1,9 +1,17 @@
 """文档标注Schema定义。"""
 
+import json
+import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Dict, Optional
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库 json
+    orjson = None
+
 
 class FileType(str, Enum):
     """支持的文档文件类型。"""
@@ -33,6 +41,38 @@ EXT_TO_FILE_TYPE: Dict[str, "FileType"] = {
 }
 
 
+def path_suffix(path: str) -> str:
+    """
+    返回路径的小写扩展名（含点，与 Path(path).suffix.lower() 一致）。
+
+    只截取文件名部分的字符串，不构造 Path 对象。
+    """
+    name = os.path.basename(path)
+    dot = name.rfind(".")
+    if dot <= 0 or dot == len(name) - 1:
+        return ""
+    return _lower_suffix(name[dot:])
+
+
+@lru_cache(maxsize=256)
+def _lower_suffix(suffix: str) -> str:
+    # 扩展名种类很少，缓存小写结果
+    return suffix.lower()
+
+
+def classify_path(path: str) -> Optional[FileType]:
+    """
+    根据扩展名判断文件类型。
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        对应的 FileType，扩展名不受支持时返回 None
+    """
+    return EXT_TO_FILE_TYPE.get(path_suffix(path))
+
+
 class LayoutType(str, Enum):
     """文档布局类型。"""
 
@@ -41,7 +81,7 @@ class LayoutType(str, Enum):
     MIXED = "mixed"
 
 
-@dataclass
+@dataclass(slots=True)
 class TableProfile:
     """
     表格特征Profile。
@@ -58,14 +98,16 @@ class TableProfile:
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典，排除None值。"""
-        return {k: v for k, v in [
-            ("long_table", self.long_table),
-            ("cross_page_table", self.cross_page_table),
-            ("table_dominant", self.table_dominant),
-        ] if v is not None}
+        result: Dict[str, Any] = {
+            "long_table": self.long_table,
+            "cross_page_table": self.cross_page_table,
+        }
+        if self.table_dominant is not None:
+            result["table_dominant"] = self.table_dominant
+        return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ChartProfile:
     """
     图表特征Profile。
@@ -83,7 +125,7 @@ class ChartProfile:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DocProfile:
     """
     文档通用标注Profile（适用于所有文档类型）。
@@ -117,7 +159,8 @@ class DocProfile:
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典，排除None值。"""
         result: Dict[str, Any] = {
-            "layout": self.layout.value,
+            # _value_ 是枚举成员的实例属性，绕过 .value 描述符
+            "layout": self.layout._value_,
             "has_image": self.has_image,
             "has_table": self.has_table,
             "has_image_table": self.has_image_table,
@@ -142,7 +185,7 @@ class DocProfile:
 PDFProfile = DocProfile
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentAnnotation:
     """
     完整的文档标注结果。
@@ -163,7 +206,7 @@ class DocumentAnnotation:
         """转换为字典用于JSON序列化。"""
         result: Dict[str, Any] = {
             "doc_id": self.doc_id,
-            "file_type": self.file_type.value,
+            "file_type": self.file_type._value_,
         }
 
         if self.file_path:
@@ -176,5 +219,16 @@ class DocumentAnnotation:
 
     def to_json(self, indent: int = 2) -> str:
         """转换为JSON字符串。"""
-        import json
+        if indent == 2 and orjson is not None:
+            return self.to_json_bytes().decode("utf-8")
         return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def to_json_bytes(self) -> bytes:
+        """
+        转换为UTF-8编码的JSON字节串（缩进2），用于写文件。
+
+        安装了 orjson 时直接由 orjson 输出字节串，省去 str 中间结果和额外的编码步骤。
+        """
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False).encode("utf-8")
@@ -1,11 +1,15 @@
 """OCR和LLM模型接口。"""
 
-from .ocr import OCRModel, MockOCR
-from .llm import LLMModel, MockLLM
+from .ocr import OCRModel, MockOCR, PaddleOCRModel, TesseractOCRModel
+from .llm import LLMModel, MockLLM, OpenAILLM, ClaudeLLM
 
 __all__ = [
     "OCRModel",
     "MockOCR",
+    "PaddleOCRModel",
+    "TesseractOCRModel",
     "LLMModel",
     "MockLLM",
+    "OpenAILLM",
+    "ClaudeLLM",
 ]
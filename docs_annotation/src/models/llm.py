@@ -1,7 +1,86 @@
 """LLM模型接口 - 用于分类和信息提取。"""
 
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用标准库 json
+    orjson = None
+
+# 解析响应/缓存文件统一使用的JSON解码函数（orjson.JSONDecodeError 是 json.JSONDecodeError 的子类）
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# 异步客户端默认连接池大小
+ASYNC_MAX_CONNECTIONS = 64
+ASYNC_MAX_KEEPALIVE = 32
+
+# CachedLLM 内存缓存的最大条目数（超出后按写入顺序淘汰）
+MEMORY_CACHE_SIZE = 10_000
+
+
+class _EventLoopThread:
+    """
+    在后台守护线程中常驻的事件循环。
+
+    同步代码通过 run() 提交协程并等待结果；所有异步客户端都在同一个循环上使用，
+    其 keep-alive 连接池可以跨多次批量调用复用。
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def run(self, coro: Awaitable) -> Any:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="llm-async", daemon=True
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+
+_ASYNC_LOOP = _EventLoopThread()
+
+
+def _run_concurrently(coros: List[Awaitable]) -> List[Any]:
+    """并发执行多个协程并按顺序返回结果；任一协程抛出异常时在全部结束后重新抛出。"""
+    async def gather():
+        return await asyncio.gather(*coros, return_exceptions=True)
+
+    results = _ASYNC_LOOP.run(gather())
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def _async_http_client(max_connections: Optional[int]):
+    """构建异步客户端共用的 httpx.AsyncClient（安装了 h2 时启用HTTP/2）。"""
+    import httpx
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections or ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=max_connections or ASYNC_MAX_KEEPALIVE,
+        ),
+    )
 
 
 class LLMModel(ABC):
@@ -50,6 +129,45 @@ class LLMModel(ABC):
         """
         pass
 
+    def classify_batch(
+        self, prompts: List[str], options: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        批量执行分类任务（默认逐条调用classify，子类可合并为一次请求）。
+
+        Args:
+            prompts: 提示词列表
+            options: 可选类别列表
+
+        Returns:
+            与prompts一一对应的分类结果列表
+        """
+        return [self.classify(prompt, options) for prompt in prompts]
+
+    def extract_batch(
+        self, prompts: List[str], schema: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """
+        批量执行信息提取（默认逐条调用extract，子类可合并为一次请求）。
+
+        Args:
+            prompts: 提示词列表
+            schema: 定义预期字段和类型的字典
+
+        Returns:
+            与prompts一一对应的提取结果列表
+        """
+        return [self.extract(prompt, schema) for prompt in prompts]
+
+    def cache_identity(self) -> str:
+        """
+        返回用于缓存键的模型标识（默认为 model 属性中的模型名称）。
+
+        包装其他模型的代理类应返回底层模型的标识。
+        """
+        model = getattr(self, "model", None)
+        return model if isinstance(model, str) else type(self).__name__
+
 
 class MockLLM(LLMModel):
     """
@@ -68,17 +186,28 @@ class MockLLM(LLMModel):
 
     def extract(self, prompt: str, schema: Dict[str, str]) -> Dict[str, Any]:
         """根据schema类型返回默认值。"""
-        result = {}
-        for field_name, field_type in schema.items():
-            if "bool" in field_type.lower():
-                result[field_name] = False
-            elif "int" in field_type.lower() or "float" in field_type.lower():
-                result[field_name] = 0
-            elif "str" in field_type.lower() or "string" in field_type.lower():
-                result[field_name] = ""
-            else:
-                result[field_name] = None
-        return result
+        return dict(_schema_defaults(tuple(schema.items())))
+
+
+# 类型描述关键字 -> MockLLM 返回的默认值（按顺序匹配，先命中者优先）
+_TYPE_DEFAULTS: Tuple[Tuple[str, Any], ...] = (
+    ("bool", False),
+    ("int", 0),
+    ("float", 0),
+    ("str", ""),
+)
+
+
+@lru_cache(maxsize=512)
+def _schema_defaults(schema_items: Tuple[Tuple[str, str], ...]) -> Dict[str, Any]:
+    """计算schema各字段的默认值（按schema缓存，调用方需复制后再返回）。"""
+    result: Dict[str, Any] = {}
+    for field_name, field_type in schema_items:
+        field_type = field_type.lower()
+        result[field_name] = next(
+            (default for token, default in _TYPE_DEFAULTS if token in field_type), None
+        )
+    return result
 
 
 class OpenAILLM(LLMModel):
@@ -93,6 +222,7 @@ class OpenAILLM(LLMModel):
         api_key: str,
         model: str = "gpt-4",
         base_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
     ):
         """
         初始化OpenAI LLM。
@@ -101,10 +231,28 @@ class OpenAILLM(LLMModel):
             api_key: OpenAI API密钥
             model: 模型名称（默认: gpt-4）
             base_url: 可选的自定义base URL
+            max_connections: 可选，连接池大小；多线程共享同一客户端时
+                设为并发数，使每个线程都能复用已建立的 keep-alive 连接
+                （未指定时异步客户端使用 ASYNC_MAX_CONNECTIONS）
         """
         try:
-            from openai import OpenAI
-            self.client = OpenAI(api_key=api_key, base_url=base_url)
+            from openai import AsyncOpenAI, OpenAI
+            http_client = None
+            if max_connections:
+                import httpx
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_connections,
+                    ),
+                )
+            self.client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+            # 批量逐条请求时使用的异步客户端，在后台事件循环上并发发送
+            self.aclient = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=_async_http_client(max_connections),
+            )
         except ImportError:
             raise ImportError(
                 "OpenAI包未安装。"
@@ -122,63 +270,248 @@ class OpenAILLM(LLMModel):
         )
         return response.choices[0].message.content or ""
 
-    def classify(self, prompt: str, options: List[str]) -> Dict[str, Any]:
+    async def _acall(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """异步调用OpenAI API。"""
+        response = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            **kwargs
+        )
+        return response.choices[0].message.content or ""
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _schema_to_properties(
+        schema_items: Tuple[Tuple[str, str], ...]
+    ) -> Dict[str, Dict[str, str]]:
         """
-        使用OpenAI进行分类。
+        将简单schema（字段项元组）转换为function calling的JSON schema属性。
 
-        使用function calling实现可靠分类。
+        按schema缓存，返回值只读共享。
         """
-        options_str = ", ".join(options)
+        properties = {}
+        for field_name, field_type in schema_items:
+            field_type = field_type.lower()
+            if "bool" in field_type:
+                properties[field_name] = {"type": "boolean"}
+            elif "int" in field_type:
+                properties[field_name] = {"type": "integer"}
+            elif "float" in field_type or "num" in field_type:
+                properties[field_name] = {"type": "number"}
+            else:
+                properties[field_name] = {"type": "string"}
+        return properties
 
-        messages = [
-            {
-                "role": "system",
-                "content": f"You are a classifier. Choose from these options: {options_str}",
-            },
-            {"role": "user", "content": prompt},
-        ]
+    @staticmethod
+    def _number_documents(prompts: List[str]) -> str:
+        """将多个提示词按编号拼接为一条消息。"""
+        return "\n\n".join(
+            f"### Document {i}\n{prompt}" for i, prompt in enumerate(prompts, 1)
+        )
 
-        # 尝试使用function calling
+    def _call_batch_function(
+        self,
+        system: str,
+        prompts: List[str],
+        item_schema: Dict[str, Any],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        一次请求处理多个提示词（function calling返回结果数组）。
+
+        Returns:
+            与prompts一一对应的结果列表；请求失败或数量不符时返回None
+        """
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": self._number_documents(prompts)},
+                ],
                 functions=[
                     {
-                        "name": "classify",
-                        "description": "Classify the input",
+                        "name": "batch_results",
+                        "description": "Return one result per document, in order",
                         "parameters": {
                             "type": "object",
                             "properties": {
-                                "label": {
-                                    "type": "string",
-                                    "enum": options,
+                                "results": {
+                                    "type": "array",
+                                    "items": item_schema,
+                                    "minItems": len(prompts),
+                                    "maxItems": len(prompts),
                                 },
-                                "confidence": {"type": "number"},
-                                "reasoning": {"type": "string"},
                             },
-                            "required": ["label"],
+                            "required": ["results"],
                         },
                     }
                 ],
-                function_call={"name": "classify"},
+                function_call={"name": "batch_results"},
+            )
+            results = _json_loads(response.choices[0].message.function_call.arguments)["results"]
+        except Exception:
+            return None
+
+        if not isinstance(results, list) or len(results) != len(prompts):
+            return None
+        return results
+
+    def classify_batch(
+        self, prompts: List[str], options: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        使用一次OpenAI请求对多个提示词分类。
+
+        结果数量不符或请求失败时回退为逐条分类（各条请求并发发送）。
+        """
+        if len(prompts) > 1:
+            results = self._call_batch_function(
+                f"You are a classifier. For each document, choose from these options: {', '.join(options)}",
+                prompts,
+                {
+                    "type": "object",
+                    "properties": {
+                        "label": {"type": "string", "enum": options},
+                        "confidence": {"type": "number"},
+                        "reasoning": {"type": "string"},
+                    },
+                    "required": ["label"],
+                },
             )
+            if results is not None:
+                return results
+        return _run_concurrently([self._aclassify(prompt, options) for prompt in prompts])
 
-            import json
-            return json.loads(response.choices[0].message.function_call.arguments)
+    def extract_batch(
+        self, prompts: List[str], schema: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """
+        使用一次OpenAI请求对多个提示词提取结构化信息。
+
+        结果数量不符或请求失败时回退为逐条提取（各条请求并发发送）。
+        """
+        if len(prompts) > 1:
+            results = self._call_batch_function(
+                "Extract structured information from each of the given documents.",
+                prompts,
+                {
+                    "type": "object",
+                    "properties": self._schema_to_properties(tuple(schema.items())),
+                    "required": list(schema.keys()),
+                },
+            )
+            if results is not None:
+                return results
+        return _run_concurrently([self._aextract(prompt, schema) for prompt in prompts])
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _classify_payload(options: Tuple[str, ...]) -> Tuple[str, List[Dict[str, Any]]]:
+        """构建分类请求的系统指令和functions（按options缓存，只读共享）。"""
+        options_str = ", ".join(options)
+        system = f"You are a classifier. Choose from these options: {options_str}"
+        functions = [
+            {
+                "name": "classify",
+                "description": "Classify the input",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "label": {
+                            "type": "string",
+                            "enum": list(options),
+                        },
+                        "confidence": {"type": "number"},
+                        "reasoning": {"type": "string"},
+                    },
+                    "required": ["label"],
+                },
+            }
+        ]
+        return system, functions
+
+    @classmethod
+    def _classify_request(cls, prompt: str, options: List[str]) -> Dict[str, Any]:
+        """构建分类请求参数（function calling）。"""
+        system, functions = cls._classify_payload(tuple(options))
+        return {
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            "functions": functions,
+            "function_call": {"name": "classify"},
+        }
+
+    @staticmethod
+    def _label_from_text(response_text: str, options: List[str]) -> Dict[str, Any]:
+        """基于文本的分类回退：在响应中搜索选项。"""
+        for option in options:
+            if option.lower() in response_text.lower():
+                return {"label": option, "confidence": 0.8, "reasoning": response_text[:100]}
+
+        return {
+            "label": options[0] if options else "unknown",
+            "confidence": 0.5,
+            "reasoning": response_text[:100],
+        }
+
+    @classmethod
+    @lru_cache(maxsize=128)
+    def _extract_functions(cls, schema_items: Tuple[Tuple[str, str], ...]) -> List[Dict[str, Any]]:
+        """构建提取请求的functions（按schema缓存，只读共享）。"""
+        schema = dict(schema_items)
+        return [
+            {
+                "name": "extract",
+                "description": "Extract information",
+                "parameters": {
+                    "type": "object",
+                    "properties": cls._schema_to_properties(schema_items),
+                    "required": list(schema.keys()),
+                },
+            }
+        ]
+
+    def _extract_request(self, prompt: str, schema: Dict[str, str]) -> Dict[str, Any]:
+        """构建提取请求参数（function calling）。"""
+        return {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "Extract structured information from the given text.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            "functions": self._extract_functions(tuple(schema.items())),
+            "function_call": {"name": "extract"},
+        }
+
+    def classify(self, prompt: str, options: List[str]) -> Dict[str, Any]:
+        """
+        使用OpenAI进行分类。
+
+        使用function calling实现可靠分类。
+        """
+        request = self._classify_request(prompt, options)
+
+        # 尝试使用function calling
+        try:
+            response = self.client.chat.completions.create(model=self.model, **request)
+            return _json_loads(response.choices[0].message.function_call.arguments)
 
         except Exception:
             # 回退到基于文本的分类
-            response_text = self._call(messages)
-            for option in options:
-                if option.lower() in response_text.lower():
-                    return {"label": option, "confidence": 0.8, "reasoning": response_text[:100]}
+            return self._label_from_text(self._call(request["messages"]), options)
 
-            return {
-                "label": options[0] if options else "unknown",
-                "confidence": 0.5,
-                "reasoning": response_text[:100],
-            }
+    async def _aclassify(self, prompt: str, options: List[str]) -> Dict[str, Any]:
+        """classify 的异步版本，供批量并发调用。"""
+        request = self._classify_request(prompt, options)
+        try:
+            response = await self.aclient.chat.completions.create(model=self.model, **request)
+            return _json_loads(response.choices[0].message.function_call.arguments)
+        except Exception:
+            return self._label_from_text(await self._acall(request["messages"]), options)
 
     def extract(self, prompt: str, schema: Dict[str, str]) -> Dict[str, Any]:
         """
@@ -186,51 +519,26 @@ class OpenAILLM(LLMModel):
 
         使用function calling实现可靠提取。
         """
-        # 构建function calling的JSON schema
-        properties = {}
-        for field_name, field_type in schema.items():
-            if "bool" in field_type.lower():
-                properties[field_name] = {"type": "boolean"}
-            elif "int" in field_type.lower():
-                properties[field_name] = {"type": "integer"}
-            elif "float" in field_type.lower() or "num" in field_type.lower():
-                properties[field_name] = {"type": "number"}
-            else:
-                properties[field_name] = {"type": "string"}
-
-        messages = [
-            {
-                "role": "system",
-                "content": "Extract structured information from the given text.",
-            },
-            {"role": "user", "content": prompt},
-        ]
-
         try:
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                functions=[
-                    {
-                        "name": "extract",
-                        "description": "Extract information",
-                        "parameters": {
-                            "type": "object",
-                            "properties": properties,
-                            "required": list(schema.keys()),
-                        },
-                    }
-                ],
-                function_call={"name": "extract"},
+                model=self.model, **self._extract_request(prompt, schema)
             )
-
-            import json
-            return json.loads(response.choices[0].message.function_call.arguments)
+            return _json_loads(response.choices[0].message.function_call.arguments)
 
         except Exception:
             # 回退: 返回空schema
             return {k: None for k in schema.keys()}
 
+    async def _aextract(self, prompt: str, schema: Dict[str, str]) -> Dict[str, Any]:
+        """extract 的异步版本，供批量并发调用。"""
+        try:
+            response = await self.aclient.chat.completions.create(
+                model=self.model, **self._extract_request(prompt, schema)
+            )
+            return _json_loads(response.choices[0].message.function_call.arguments)
+        except Exception:
+            return {k: None for k in schema.keys()}
+
 
 class ClaudeLLM(LLMModel):
     """
@@ -252,8 +560,10 @@ class ClaudeLLM(LLMModel):
             model: 模型名称（默认: claude-3-5-sonnet-20241022）
         """
         try:
-            from anthropic import Anthropic
+            from anthropic import Anthropic, AsyncAnthropic
             self.client = Anthropic(api_key=api_key)
+            # 批量请求时使用的异步客户端，在后台事件循环上并发发送
+            self.aclient = AsyncAnthropic(api_key=api_key, http_client=_async_http_client(None))
         except ImportError:
             raise ImportError(
                 "Anthropic包未安装。"
@@ -262,40 +572,53 @@ class ClaudeLLM(LLMModel):
 
         self.model = model
 
-    def _call(self, prompt: str, max_tokens: int = 1024) -> str:
-        """调用Claude API。"""
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return message.content[0].text
-
-    def classify(self, prompt: str, options: List[str]) -> Dict[str, Any]:
+    def _call(self, prompt: str, max_tokens: int = 1024, system: Optional[str] = None) -> str:
         """
-        使用Claude进行分类。
+        调用Claude API。
 
-        使用提示工程进行分类。
+        system 为各请求相同的固定指令，标记为 ephemeral 缓存，
+        重复请求时服务端可复用该前缀。
         """
+        message = self.client.messages.create(**self._request(prompt, max_tokens, system))
+        return message.content[0].text
+
+    async def _acall(self, prompt: str, max_tokens: int = 1024, system: Optional[str] = None) -> str:
+        """异步调用Claude API。"""
+        message = await self.aclient.messages.create(**self._request(prompt, max_tokens, system))
+        return message.content[0].text
+
+    def _request(self, prompt: str, max_tokens: int, system: Optional[str]) -> Dict[str, Any]:
+        """构建 messages.create 的请求参数。"""
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system:
+            kwargs["system"] = [
+                {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+            ]
+        return kwargs
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _classify_system(options: Tuple[str, ...]) -> str:
+        """构建分类任务的固定指令（按options缓存）。"""
         options_str = ", ".join(options)
 
-        full_prompt = f"""Classify the following document description.
+        return f"""Classify the following document description.
 
 Options: {options_str}
 
 Respond in JSON format:
 {{"label": "your_choice", "confidence": 0.0-1.0, "reasoning": "brief explanation"}}
-
-Document:
-{prompt}
 """
 
-        response = self._call(full_prompt)
-
-        # 从响应中解析JSON
-        import json
+    @staticmethod
+    def _parse_classification(response: str, options: List[str]) -> Dict[str, Any]:
+        """从响应中解析分类结果。"""
         try:
-            result = json.loads(response)
+            result = _json_loads(response)
             return {
                 "label": result.get("label", options[0] if options else "unknown"),
                 "confidence": result.get("confidence", 0.8),
@@ -309,31 +632,44 @@ Document:
 
             return {"label": options[0] if options else "unknown", "confidence": 0.5, "reasoning": response[:100]}
 
-    def extract(self, prompt: str, schema: Dict[str, str]) -> Dict[str, Any]:
+    def classify(self, prompt: str, options: List[str]) -> Dict[str, Any]:
         """
-        使用Claude提取结构化信息。
+        使用Claude进行分类。
 
-        使用提示工程进行提取。
+        使用提示工程进行分类。
         """
-        schema_str = "\n".join(f"- {k}: {v}" for k, v in schema.items())
+        response = self._call(f"Document:\n{prompt}\n", system=self._classify_system(tuple(options)))
+        return self._parse_classification(response, options)
+
+    def classify_batch(
+        self, prompts: List[str], options: List[str]
+    ) -> List[Dict[str, Any]]:
+        """并发发送多个分类请求（共享同一固定指令前缀）。"""
+        system = self._classify_system(tuple(options))
+        responses = _run_concurrently(
+            [self._acall(f"Document:\n{prompt}\n", system=system) for prompt in prompts]
+        )
+        return [self._parse_classification(response, options) for response in responses]
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _extract_system(schema_items: Tuple[Tuple[str, str], ...]) -> str:
+        """构建提取任务的固定指令（按schema缓存）。"""
+        schema_str = "\n".join(f"- {k}: {v}" for k, v in schema_items)
 
-        full_prompt = f"""Extract structured information from the following document.
+        return f"""Extract structured information from the following document.
 
 Output schema:
 {schema_str}
 
 Respond in JSON format with exactly these fields.
-
-Document:
-{prompt}
 """
 
-        response = self._call(full_prompt)
-
-        # 从响应中解析JSON
-        import json
+    @staticmethod
+    def _parse_extraction(response: str, schema: Dict[str, str]) -> Dict[str, Any]:
+        """从响应中解析提取结果，确保所有schema键都存在。"""
         try:
-            result = json.loads(response)
+            result = _json_loads(response)
             # 确保所有schema键都存在
             for key in schema.keys():
                 if key not in result:
@@ -341,3 +677,538 @@ Document:
             return result
         except json.JSONDecodeError:
             return {k: None for k in schema.keys()}
+
+    def extract(self, prompt: str, schema: Dict[str, str]) -> Dict[str, Any]:
+        """
+        使用Claude提取结构化信息。
+
+        使用提示工程进行提取。
+        """
+        response = self._call(f"Document:\n{prompt}\n", system=self._extract_system(tuple(schema.items())))
+        return self._parse_extraction(response, schema)
+
+    def extract_batch(
+        self, prompts: List[str], schema: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """并发发送多个提取请求（共享同一固定指令前缀）。"""
+        system = self._extract_system(tuple(schema.items()))
+        responses = _run_concurrently(
+            [self._acall(f"Document:\n{prompt}\n", system=system) for prompt in prompts]
+        )
+        return [self._parse_extraction(response, schema) for response in responses]
+
+
+class BatchingLLM(LLMModel):
+    """
+    微批LLM代理 - 合并并发请求以减少API往返次数。
+
+    多个线程并发调用classify/extract时，请求先进入缓冲区；同类请求
+    （相同的options或schema）数量达到batch_size，或最早的请求等待超过
+    max_wait_ms时，由后台线程调用底层模型的classify_batch/extract_batch
+    一次性处理，再把结果分发给各调用方。
+
+    仅在多线程并发调用时有意义；单线程调用会为每个请求额外等待max_wait_ms。
+    """
+
+    def __init__(
+        self,
+        model: LLMModel,
+        batch_size: int = 16,
+        max_wait_ms: float = 500,
+        max_concurrent_batches: int = 4,
+    ):
+        """
+        初始化微批代理。
+
+        Args:
+            model: 底层LLM模型
+            batch_size: 单批最大请求数
+            max_wait_ms: 最早请求的最长等待时间（毫秒）
+            max_concurrent_batches: 同时在途的批请求数
+        """
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._cond = threading.Condition()
+        self._pending: Dict[Tuple, List[Tuple[str, Future]]] = {}
+        self._first_enqueue: Dict[Tuple, float] = {}
+        self._dispatcher: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches)
+
+    def classify(self, prompt: str, options: List[str]) -> Dict[str, Any]:
+        """提交分类请求并等待所在批次完成。"""
+        return self._submit(("classify", tuple(options)), prompt)
+
+    def extract(self, prompt: str, schema: Dict[str, str]) -> Dict[str, Any]:
+        """提交提取请求并等待所在批次完成。"""
+        return self._submit(("extract", tuple(schema.items())), prompt)
+
+    def cache_identity(self) -> str:
+        """微批不改变结果，使用底层模型的标识。"""
+        return self.model.cache_identity()
+
+    def _submit(self, key: Tuple, prompt: str) -> Dict[str, Any]:
+        """将请求放入对应缓冲区，阻塞直到结果返回。"""
+        future: Future = Future()
+        with self._cond:
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+                self._dispatcher.start()
+            bucket = self._pending.setdefault(key, [])
+            if not bucket:
+                self._first_enqueue[key] = time.monotonic()
+            bucket.append((prompt, future))
+            self._cond.notify()
+        return future.result()
+
+    def _dispatch_loop(self) -> None:
+        """后台线程：按数量或等待时间触发批次。"""
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    ready = [
+                        key for key, bucket in self._pending.items()
+                        if len(bucket) >= self.batch_size
+                        or now - self._first_enqueue[key] >= self.max_wait
+                    ]
+                    if ready:
+                        break
+                    timeout = None
+                    if self._pending:
+                        timeout = min(self._first_enqueue.values()) + self.max_wait - now
+                    self._cond.wait(timeout)
+
+                batches = []
+                for key in ready:
+                    bucket = self._pending.pop(key)
+                    del self._first_enqueue[key]
+                    for i in range(0, len(bucket), self.batch_size):
+                        batches.append((key, bucket[i:i + self.batch_size]))
+
+            for key, items in batches:
+                self._executor.submit(self._flush, key, items)
+
+    def _flush(self, key: Tuple, items: List[Tuple[str, Future]]) -> None:
+        """执行一个批次并把结果分发给各调用方。"""
+        kind, arg = key
+        prompts = [prompt for prompt, _ in items]
+        try:
+            if kind == "classify":
+                results = self.model.classify_batch(prompts, list(arg))
+            else:
+                results = self.model.extract_batch(prompts, dict(arg))
+            if len(results) != len(items):
+                raise ValueError(
+                    f"Batch returned {len(results)} results for {len(items)} prompts"
+                )
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(items, results):
+            future.set_result(result)
+
+
+class RoutingLLM(LLMModel):
+    """
+    模型路由代理 - 先用低成本模型，结果不可靠时再交给高性能模型。
+
+    分类结果的标签不在可选项中或自报置信度低于 min_confidence，
+    提取结果缺少 schema 中的任一字段（或为 None）时，视为不可靠并升级重试。
+    """
+
+    def __init__(
+        self,
+        fast_model: LLMModel,
+        strong_model: LLMModel,
+        min_confidence: float = 0.7,
+    ):
+        """
+        初始化路由代理。
+
+        Args:
+            fast_model: 低成本模型（默认使用）
+            strong_model: 高性能模型（升级时使用）
+            min_confidence: 分类结果的最低置信度
+        """
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.min_confidence = min_confidence
+        # 升级次数：多个线程可能同时调用，计数在锁内更新
+        self.escalations = 0
+        self._escalations_lock = threading.Lock()
+
+    def cache_identity(self) -> str:
+        """路由结果取决于两个模型和阈值。"""
+        return (
+            f"{self.fast_model.cache_identity()}->{self.strong_model.cache_identity()}"
+            f"@{self.min_confidence}"
+        )
+
+    def _count_escalations(self, count: int) -> None:
+        with self._escalations_lock:
+            self.escalations += count
+
+    def _classify_ok(self, result: Dict[str, Any], options: List[str]) -> bool:
+        if result.get("label") not in options:
+            return False
+        try:
+            return float(result.get("confidence", 0.0)) >= self.min_confidence
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def _extract_ok(result: Dict[str, Any], schema: Dict[str, str]) -> bool:
+        return all(result.get(key) is not None for key in schema)
+
+    def classify(self, prompt: str, options: List[str]) -> Dict[str, Any]:
+        """先用低成本模型分类，不可靠时升级。"""
+        result = self.fast_model.classify(prompt, options)
+        if self._classify_ok(result, options):
+            return result
+        self._count_escalations(1)
+        return self.strong_model.classify(prompt, options)
+
+    def extract(self, prompt: str, schema: Dict[str, str]) -> Dict[str, Any]:
+        """先用低成本模型提取，字段不完整时升级。"""
+        result = self.fast_model.extract(prompt, schema)
+        if self._extract_ok(result, schema):
+            return result
+        self._count_escalations(1)
+        return self.strong_model.extract(prompt, schema)
+
+    def classify_batch(
+        self, prompts: List[str], options: List[str]
+    ) -> List[Dict[str, Any]]:
+        """批量分类：不可靠的结果合并为一批交给高性能模型。"""
+        results = self.fast_model.classify_batch(prompts, options)
+        retry = [i for i, result in enumerate(results) if not self._classify_ok(result, options)]
+        return self._escalate(
+            results, prompts, retry,
+            lambda missed: self.strong_model.classify_batch(missed, options),
+        )
+
+    def extract_batch(
+        self, prompts: List[str], schema: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """批量提取：字段不完整的结果合并为一批交给高性能模型。"""
+        results = self.fast_model.extract_batch(prompts, schema)
+        retry = [i for i, result in enumerate(results) if not self._extract_ok(result, schema)]
+        return self._escalate(
+            results, prompts, retry,
+            lambda missed: self.strong_model.extract_batch(missed, schema),
+        )
+
+    def _escalate(self, results: List[Dict[str, Any]], prompts: List[str], retry: List[int], call):
+        if retry:
+            self._count_escalations(len(retry))
+            for i, result in zip(retry, call([prompts[i] for i in retry])):
+                results[i] = result
+        return results
+
+
+class CachedLLM(LLMModel):
+    """
+    磁盘缓存LLM代理 - 相同请求直接返回缓存结果。
+
+    以 (模型名, 方法, 提示词, options/schema) 的SHA256作为键，
+    结果保存为 cache_dir/<键前两位>/<键>.json，写入时先写临时文件再原子替换，
+    多线程/多进程同时写入同一键也不会产生损坏的缓存文件。
+
+    设置 semantic_threshold 后额外启用语义缓存：精确键未命中时，
+    在相同方法和 options/schema 的已缓存提示词中查找余弦相似度最高的一条，
+    不低于阈值即复用其结果（适用于模板化表格等近似重复的文档）。
+    需要: pip install sentence-transformers
+
+    磁盘缓存之前还有一层进程内缓存：以 (方法, options/schema, 提示词的blake2b摘要) 为键，
+    命中时无需序列化请求、计算SHA256或读文件；返回的结果字典在调用方之间共享，不应修改。
+    """
+
+    def __init__(
+        self,
+        model: LLMModel,
+        cache_dir: str,
+        semantic_threshold: Optional[float] = None,
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+    ):
+        """
+        初始化缓存代理。
+
+        Args:
+            model: 底层LLM模型
+            cache_dir: 缓存目录
+            semantic_threshold: 语义缓存的相似度阈值（None 表示只做精确匹配）
+            embedding_model: 语义缓存使用的句向量模型
+        """
+        self.model = model
+        self.cache_dir = Path(cache_dir)
+        self.model_name = model.cache_identity()
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: Dict[Tuple, Dict[str, Any]] = {}
+        self._memory_lock = threading.Lock()
+        # 单槽快速路径：连续相同的请求只需比较一次键
+        self._last: Optional[Tuple[Tuple, Dict[str, Any]]] = None
+
+        self.semantic_threshold = semantic_threshold
+        self.semantic_hits = 0
+        self._semantic = None
+        if semantic_threshold is not None:
+            self._semantic = _SemanticIndex(self.cache_dir / "semantic.sqlite", embedding_model)
+
+    def _key(self, method: str, prompt: str, spec: Any) -> str:
+        """计算请求的缓存键。"""
+        payload = json.dumps(
+            {"model": self.model_name, "method": method, "prompt": prompt, "spec": spec},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _memory_key(method: str, prompt: str, spec: Tuple) -> Tuple:
+        """计算进程内缓存键（spec 需为可哈希的元组）。"""
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+        return (method, spec, digest)
+
+    def _remember(self, memory_key: Tuple) -> Optional[Dict[str, Any]]:
+        """查询进程内缓存。"""
+        last = self._last
+        if last is not None and last[0] == memory_key:
+            return last[1]
+        result = self._memory.get(memory_key)
+        if result is not None:
+            self._last = (memory_key, result)
+        return result
+
+    def _memorize(self, memory_key: Tuple, result: Dict[str, Any]) -> None:
+        """写入进程内缓存，超出容量时淘汰最早写入的条目。"""
+        with self._memory_lock:
+            if memory_key not in self._memory and len(self._memory) >= MEMORY_CACHE_SIZE:
+                del self._memory[next(iter(self._memory))]
+            self._memory[memory_key] = result
+        self._last = (memory_key, result)
+
+    def _bucket(self, method: str, spec: Any) -> str:
+        """语义缓存分桶：只在相同模型、方法和 options/schema 的请求之间匹配。"""
+        return self._key(method, "", spec)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存文件，不存在或损坏时返回None。"""
+        try:
+            with open(self._path(key), "rb") as f:
+                return _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key: str, result: Dict[str, Any]) -> None:
+        """原子写入缓存（写入失败不影响标注流程）。"""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def _lookup(self, method: str, prompt: str, spec: Any, key: str) -> Optional[Dict[str, Any]]:
+        """先精确匹配，再（可选）语义匹配。"""
+        result = self._load(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        if self._semantic is not None:
+            similar_key = self._semantic.search(
+                self._bucket(method, spec), prompt, self.semantic_threshold
+            )
+            if similar_key is not None:
+                result = self._load(similar_key)
+                if result is not None:
+                    self.semantic_hits += 1
+                    return result
+
+        self.misses += 1
+        return None
+
+    @staticmethod
+    def _degraded(method: str, result: Dict[str, Any]) -> bool:
+        """
+        判断结果是否为底层模型的失败回退。
+
+        请求失败或响应无法解析时，extract 回退为所有字段均为 None 的字典；
+        这类结果不写入任何缓存，下次调用重新请求。
+        """
+        return method == "extract" and bool(result) and all(v is None for v in result.values())
+
+    def _save(self, method: str, prompt: str, spec: Any, key: str, result: Dict[str, Any]) -> None:
+        self._store(key, result)
+        if self._semantic is not None:
+            self._semantic.add(self._bucket(method, spec), prompt, key)
+
+    def classify(self, prompt: str, options: List[str]) -> Dict[str, Any]:
+        """带缓存的分类。"""
+        memory_key = self._memory_key("classify", prompt, tuple(options))
+        result = self._remember(memory_key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        spec = list(options)
+        key = self._key("classify", prompt, spec)
+        result = self._lookup("classify", prompt, spec, key)
+        if result is None:
+            result = self.model.classify(prompt, options)
+            self._save("classify", prompt, spec, key, result)
+        self._memorize(memory_key, result)
+        return result
+
+    def extract(self, prompt: str, schema: Dict[str, str]) -> Dict[str, Any]:
+        """带缓存的信息提取。"""
+        memory_key = self._memory_key("extract", prompt, tuple(schema.items()))
+        result = self._remember(memory_key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        key = self._key("extract", prompt, schema)
+        result = self._lookup("extract", prompt, schema, key)
+        if result is None:
+            result = self.model.extract(prompt, schema)
+            if self._degraded("extract", result):
+                return result
+            self._save("extract", prompt, schema, key, result)
+        self._memorize(memory_key, result)
+        return result
+
+    def classify_batch(
+        self, prompts: List[str], options: List[str]
+    ) -> List[Dict[str, Any]]:
+        """带缓存的批量分类：只把未命中的提示词交给底层模型。"""
+        return self._batch(
+            "classify", prompts, list(options), tuple(options),
+            lambda missed: self.model.classify_batch(missed, options),
+        )
+
+    def extract_batch(
+        self, prompts: List[str], schema: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """带缓存的批量提取：只把未命中的提示词交给底层模型。"""
+        return self._batch(
+            "extract", prompts, schema, tuple(schema.items()),
+            lambda missed: self.model.extract_batch(missed, schema),
+        )
+
+    def _batch(
+        self, method: str, prompts: List[str], spec: Any, memory_spec: Tuple, call
+    ) -> List[Dict[str, Any]]:
+        memory_keys = [self._memory_key(method, prompt, memory_spec) for prompt in prompts]
+        results: List[Optional[Dict[str, Any]]] = []
+        keys: Dict[int, str] = {}
+        for i, (prompt, memory_key) in enumerate(zip(prompts, memory_keys)):
+            result = self._remember(memory_key)
+            if result is not None:
+                self.hits += 1
+            else:
+                keys[i] = self._key(method, prompt, spec)
+                result = self._lookup(method, prompt, spec, keys[i])
+                if result is not None:
+                    self._memorize(memory_key, result)
+            results.append(result)
+
+        missed = [i for i, result in enumerate(results) if result is None]
+        if missed:
+            for i, result in zip(missed, call([prompts[i] for i in missed])):
+                results[i] = result
+                if self._degraded(method, result):
+                    continue
+                self._save(method, prompts[i], spec, keys[i], result)
+                self._memorize(memory_keys[i], result)
+        return results
+
+
+class _SemanticIndex:
+    """
+    语义缓存索引 - 保存已缓存提示词的归一化句向量。
+
+    向量和对应的缓存键持久化在 sqlite 中，按桶加载到内存矩阵，
+    查询时一次矩阵乘法得到与全部已缓存提示词的余弦相似度。
+    """
+
+    def __init__(self, db_path: Path, embedding_model: str):
+        try:
+            import numpy as np
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError(
+                "语义缓存需要sentence-transformers。"
+                "请使用: pip install sentence-transformers"
+            )
+        import sqlite3
+
+        self._np = np
+        self._encoder = SentenceTransformer(embedding_model)
+        self._lock = threading.Lock()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "bucket TEXT, key TEXT, embedding BLOB, PRIMARY KEY (bucket, key))"
+        )
+        self._db.commit()
+
+        # 桶 -> (缓存键列表, 向量矩阵)
+        self._buckets: Dict[str, Tuple[List[str], Any]] = {}
+
+    def _embed(self, prompt: str):
+        return self._encoder.encode(
+            prompt, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(self._np.float32)
+
+    def _load_bucket(self, bucket: str) -> Tuple[List[str], Any]:
+        if bucket not in self._buckets:
+            rows = self._db.execute(
+                "SELECT key, embedding FROM entries WHERE bucket = ?", (bucket,)
+            ).fetchall()
+            keys = [row[0] for row in rows]
+            vectors = [self._np.frombuffer(row[1], dtype=self._np.float32) for row in rows]
+            matrix = self._np.vstack(vectors) if vectors else None
+            self._buckets[bucket] = (keys, matrix)
+        return self._buckets[bucket]
+
+    def search(self, bucket: str, prompt: str, threshold: float) -> Optional[str]:
+        """返回相似度不低于阈值的最近缓存键，没有则返回None。"""
+        vector = self._embed(prompt)
+        with self._lock:
+            keys, matrix = self._load_bucket(bucket)
+            if matrix is None:
+                return None
+            scores = matrix @ vector
+            best = int(scores.argmax())
+            if scores[best] < threshold:
+                return None
+            return keys[best]
+
+    def add(self, bucket: str, prompt: str, key: str) -> None:
+        """加入一条新缓存的提示词向量。"""
+        vector = self._embed(prompt)
+        with self._lock:
+            keys, matrix = self._load_bucket(bucket)
+            if key in keys:
+                return
+            self._db.execute(
+                "INSERT OR IGNORE INTO entries (bucket, key, embedding) VALUES (?, ?, ?)",
+                (bucket, key, vector.tobytes()),
+            )
+            self._db.commit()
+            matrix = vector[None, :] if matrix is None else self._np.vstack([matrix, vector])
+            self._buckets[bucket] = (keys + [key], matrix)
@@ -1,7 +1,23 @@
 """OCR模型接口 - 用于元素检测。"""
 
+import io
+import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:  # PaddleOCR 依赖 numpy，仅使用其他OCR模型时可不安装
+    np = None
+
+
+def _decode_image(image_data: bytes) -> Image.Image:
+    """将页面图像字节解码为PIL图像。"""
+    return Image.open(io.BytesIO(image_data))
 
 
 class OCRModel(ABC):
@@ -51,6 +67,18 @@ class OCRModel(ABC):
         """
         pass
 
+    def detect_elements_batch(self, images: List[bytes]) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        批量检测多页图像中的元素（默认逐页调用detect_elements，子类可并行处理）。
+
+        Args:
+            images: 原始图像字节列表
+
+        Returns:
+            与images一一对应的检测元素字典列表，格式与detect_elements相同
+        """
+        return [self.detect_elements(image_data) for image_data in images]
+
 
 class MockOCR(OCRModel):
     """
@@ -77,43 +105,55 @@ class PaddleOCRModel(OCRModel):
     """
     PaddleOCR实现。
 
+    PaddleOCR 的预测器不是线程安全的：同一实例被多个线程共享时（如线程池并发标注），
+    ocr() 调用在实例锁内串行执行。需要并行OCR时使用进程池，每个进程各持一个实例。
+
     需要: pip install paddleocr
     """
 
-    def __init__(self, lang: str = "ch", use_angle_cls: bool = True):
+    def __init__(
+        self,
+        lang: str = "ch",
+        use_angle_cls: bool = True,
+        device: Optional[str] = None,
+    ):
         """
         初始化PaddleOCR。
 
         Args:
             lang: 语言代码（'ch'中文，'en'英文）
             use_angle_cls: 是否使用角度分类器
+            device: 可选，运行设备，如 "cpu"、"gpu:0"（默认由 PaddleOCR 自行选择）
         """
+        kwargs: Dict[str, Any] = {}
+        if device:
+            kind, _, index = device.partition(":")
+            kwargs["use_gpu"] = kind == "gpu"
+            if kind == "gpu" and index:
+                kwargs["gpu_id"] = int(index)
+
         try:
             from paddleocr import PaddleOCR as PPOCR
-            self.model = PPOCR(use_angle_cls=use_angle_cls, lang=lang)
+            self.model = PPOCR(use_angle_cls=use_angle_cls, lang=lang, **kwargs)
         except ImportError:
             raise ImportError(
                 "PaddleOCR未安装。"
                 "请使用: pip install paddleocr"
             )
+        self._ocr_lock = threading.Lock()
 
-    def detect_elements(self, image_data: bytes) -> Dict[str, List[Dict[str, Any]]]:
-        """
-        使用PaddleOCR检测元素。
-
-        Note: 这是基础实现。
-        生产环境建议使用专用检测模型。
-        """
-        import io
-        from PIL import Image
-
-        # 将字节转换为PIL图像
-        image = Image.open(io.BytesIO(image_data))
-
-        # 运行OCR
-        result = self.model.ocr(image, cls=True)
+    def _ocr_lines(self, image_data: bytes) -> List[Any]:
+        """运行OCR，返回识别出的行列表（[多边形, (文本, 置信度)]）。"""
+        image = _decode_image(image_data)
+        with self._ocr_lock:
+            result = self.model.ocr(image, cls=True)
+        if not result or not result[0]:
+            return []
+        return result[0]
 
-        # 解析结果（基础实现）
+    @staticmethod
+    def _lines_to_elements(lines: List[Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """将识别行转换为检测元素字典（基础实现）。"""
         detected: Dict[str, List[Dict[str, Any]]] = {
             "images": [],
             "tables": [],
@@ -121,32 +161,35 @@ class PaddleOCRModel(OCRModel):
             "charts": [],
         }
 
-        if result and result[0]:
-            for line in result[0]:
-                bbox = line[0]  # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-                # 将多边形转换为bbox [x1, y1, x2, y2]
-                x_coords = [p[0] for p in bbox]
-                y_coords = [p[1] for p in bbox]
-                detected["images"].append({
-                    "bbox": [min(x_coords), min(y_coords), max(x_coords), max(y_coords)],
-                    "confidence": line[1][1],
-                })
+        if lines:
+            # 多边形 [[x1,y1], [x2,y2], [x3,y3], [x4,y4]] 组成 (N, 4, 2) 数组，
+            # 一次求出所有行的 bbox [x1, y1, x2, y2]
+            quads = np.asarray([line[0] for line in lines], dtype=np.float64)
+            bboxes = np.concatenate([quads.min(axis=1), quads.max(axis=1)], axis=1).tolist()
+            detected["images"] = [
+                {"bbox": bbox, "confidence": line[1][1]}
+                for bbox, line in zip(bboxes, lines)
+            ]
 
         return detected
 
-    def extract_text(self, image_data: bytes) -> str:
-        """使用PaddleOCR提取文本。"""
-        import io
-        from PIL import Image
+    @staticmethod
+    def _lines_to_text(lines: List[Any]) -> str:
+        """拼接识别行的文本。"""
+        return "\n".join(line[1][0] for line in lines)
 
-        image = Image.open(io.BytesIO(image_data))
-        result = self.model.ocr(image, cls=True)
+    def detect_elements(self, image_data: bytes) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        使用PaddleOCR检测元素。
 
-        if not result or not result[0]:
-            return ""
+        Note: 这是基础实现。
+        生产环境建议使用专用检测模型。
+        """
+        return self._lines_to_elements(self._ocr_lines(image_data))
 
-        texts = [line[1][0] for line in result[0]]
-        return "\n".join(texts)
+    def extract_text(self, image_data: bytes) -> str:
+        """使用PaddleOCR提取文本。"""
+        return self._lines_to_text(self._ocr_lines(image_data))
 
 
 class TesseractOCRModel(OCRModel):
@@ -182,14 +225,9 @@ class TesseractOCRModel(OCRModel):
         Note: Tesseract本身不原生支持检测表格/图表等元素。
         此实现主要关注文本区域。
         """
-        import io
-        from PIL import Image
-
-        image = Image.open(io.BytesIO(image_data))
-
         # 获取字典格式的数据
         data = self.pytesseract.image_to_data(
-            image, lang=self.lang, output_type=self.pytesseract.Output.DICT
+            _decode_image(image_data), lang=self.lang, output_type=self.pytesseract.Output.DICT
         )
 
         detected: Dict[str, List[Dict[str, Any]]] = {
@@ -199,23 +237,30 @@ class TesseractOCRModel(OCRModel):
             "charts": [],
         }
 
-        # 将文本分组为块
-        n_boxes = len(data["text"])
-        for i in range(n_boxes):
-            text = data["text"][i].strip()
-            if text:
-                x, y, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
-                detected["images"].append({
-                    "bbox": [x, y, x + w, y + h],
-                    "confidence": data["conf"][i] / 100.0,
-                })
+        # 将文本分组为块：按列并行遍历 DICT 输出，跳过空文本
+        detected["images"] = [
+            {"bbox": [x, y, x + w, y + h], "confidence": conf / 100.0}
+            for text, x, y, w, h, conf in zip(
+                data["text"], data["left"], data["top"],
+                data["width"], data["height"], data["conf"],
+            )
+            if text.strip()
+        ]
 
         return detected
 
     def extract_text(self, image_data: bytes) -> str:
         """使用Tesseract提取文本。"""
-        import io
-        from PIL import Image
+        return self.pytesseract.image_to_string(_decode_image(image_data), lang=self.lang)
 
-        image = Image.open(io.BytesIO(image_data))
-        return self.pytesseract.image_to_string(image, lang=self.lang)
+    def detect_elements_batch(self, images: List[bytes]) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        并行检测多页图像中的文本区域。
+
+        pytesseract 每次调用都会启动独立的 tesseract 进程，
+        线程池即可让各页的识别在多个CPU核上同时运行。
+        """
+        if len(images) <= 1:
+            return super().detect_elements_batch(images)
+        with ThreadPoolExecutor(max_workers=min(len(images), os.cpu_count() or 1)) as executor:
+            return list(executor.map(self.detect_elements, images))
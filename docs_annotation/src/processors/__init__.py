@@ -1,9 +1,36 @@
 """文档标注处理器模块。"""
 
-from .doc_parser import DocParser, DocContent, ParserBackend, create_parser
-from .element_detector import ElementDetector, ElementList
-from .feature_extractor import FeatureExtractor, FeatureSet
-from .layout_classifier import LayoutClassifier
+import importlib
+
+# 导出名称 -> 所在子模块；首次访问时才导入（PEP 562），
+# 只用到某一个处理器子模块时不会连带导入其余处理器
+_LAZY = {
+    "DocParser": ".doc_parser",
+    "DocContent": ".doc_parser",
+    "ParserBackend": ".doc_parser",
+    "create_parser": ".doc_parser",
+    "ElementDetector": ".element_detector",
+    "ElementList": ".element_detector",
+    "FeatureExtractor": ".feature_extractor",
+    "FeatureSet": ".feature_extractor",
+    "LayoutClassifier": ".layout_classifier",
+}
+
+
+def __getattr__(name):
+    """按需导入并缓存导出的处理器类。"""
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
 
 # 延迟导入 DoclingParser（避免 Docling 未安装时报错）
 def get_docling_parser():
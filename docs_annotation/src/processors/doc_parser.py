@@ -1,20 +1,147 @@
 """文档解析器 - 支持多种文件类型。"""
 
+import codecs
+import hashlib
+import io
+import json
 import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
 import warnings
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import itemgetter
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from ..core.base import BaseProcessor, ProcessResult
-from ..core.schema import DocumentAnnotation, FileType, EXT_TO_FILE_TYPE
+from ..core.schema import DocumentAnnotation, FileType, classify_path
 from ..core.logger import get_logger
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # 未安装时通过 pdfplumber 的 page.to_image() 渲染
+    pdfium = None
+
 # 抑制 pdfminer 的字体警告
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 warnings.filterwarnings("ignore", message=".*FontBBox.*")
 
+# 页面图像编码的线程数与最多积压的未编码页数（PIL压缩时释放GIL，可与页面解析并行）
+PNG_ENCODE_WORKERS = os.cpu_count() or 1
+MAX_PENDING_PAGE_IMAGES = PNG_ENCODE_WORKERS * 2
+
+# 按页并行解析PDF时每个工作进程任务包含的页数（每个任务都要重新打开PDF，页段不宜过小）
+PDF_PAGES_PER_TASK = 16
+
+# Excel 中检测到超过该数量的公式后不再逐格检查公式
+EXCEL_FORMULA_LIMIT = 10
+
+# 页面图像的渲染缩放比例（1.0 即 72dpi，与 pdfplumber page.to_image() 的默认分辨率一致）
+PAGE_RENDER_SCALE = 1.0
+
+
+# PDFium（pypdfium2，也是 pdfplumber page.to_image() 的渲染后端）和 MuPDF 都不是线程安全的，
+# 批量标注的线程池会同时解析多个PDF，进程内对它们的所有调用都分别持有对应的锁
+_PDFIUM_LOCK = threading.RLock()
+_PYMUPDF_LOCK = threading.RLock()
+
+# 解析PDF期间屏蔽 pdfminer 直接打印到 stderr 的字体警告。sys.stderr 是进程全局的，
+# 多个线程同时解析时按引用计数处理：第一个进入的线程替换、最后一个离开的线程恢复
+_stderr_lock = threading.Lock()
+_stderr_depth = 0
+_saved_stderr = None
+_devnull = None
+
+
+@contextmanager
+def _quiet_stderr():
+    """在代码块执行期间把 sys.stderr 重定向到空设备（可在多个线程中同时嵌套使用）。"""
+    global _stderr_depth, _saved_stderr, _devnull
+    with _stderr_lock:
+        if _stderr_depth == 0:
+            if _devnull is None:
+                _devnull = open(os.devnull, "w")
+            _saved_stderr = sys.stderr
+            sys.stderr = _devnull
+        _stderr_depth += 1
+    try:
+        yield
+    finally:
+        with _stderr_lock:
+            _stderr_depth -= 1
+            if _stderr_depth == 0:
+                sys.stderr = _saved_stderr
+                _saved_stderr = None
+
+
+# WordprocessingML 命名空间（XPath 中使用 w 前缀）
+_W_NS = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+
+
+@lru_cache(maxsize=None)
+def _docx_xpath(expr: str):
+    """编译并缓存 DOCX 使用的 XPath 表达式（lxml 仅在解析 Word 文档时才需要）。"""
+    from lxml import etree
+    return etree.XPath(expr, namespaces=_W_NS)
+
+
+# 页面图像编码格式 -> PIL保存参数；JPEG 编码远快于 PNG 的 zlib 压缩，
+# 但为有损格式，默认仍使用 PNG 以保持 OCR 输入不变
+PAGE_IMAGE_FORMATS = {
+    "PNG": {},
+    "JPEG": {"quality": 85},
+}
+
+
+# 文本文件依次尝试的编码（GBK 是 GB2312 的超集，无需再单独尝试 GB2312；
+# latin-1 可解码任意字节，作为最后的兜底）
+TEXT_ENCODINGS = ("utf-8", "gbk", "latin-1")
+# 带 BOM 的 UTF-32/UTF-16 文件按 BOM 确定编码（UTF-32 LE 的 BOM 以 UTF-16 LE 的 BOM 开头，需先判断）
+TEXT_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _decode_text(raw: bytes) -> str:
+    """将整个文本文件的字节解码为字符串（只读一次文件，在内存中尝试各编码）。"""
+    text = None
+    for bom, encoding in TEXT_BOMS:
+        if raw.startswith(bom):
+            try:
+                text = raw.decode(encoding)
+            except UnicodeDecodeError:
+                pass
+            break
+    if text is None:
+        for encoding in TEXT_ENCODINGS:
+            try:
+                text = raw.decode(encoding)
+                break
+            except UnicodeDecodeError:
+                continue
+    # 与文本模式 open() 的通用换行处理保持一致
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _encode_page_image(image, image_format: str = "PNG") -> bytes:
+    """将PIL图像编码为指定格式（PNG/JPEG）的字节。"""
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **PAGE_IMAGE_FORMATS[image_format])
+    return buffer.getvalue()
+
 
 class ParserBackend(str, Enum):
     """解析器后端类型。"""
@@ -103,6 +230,26 @@ class DocParser(BaseProcessor):
             ["pdf", "doc", "docx", "xls", "xlsx", "ppt", "pptx", "html", "htm", "txt", "md"]
         )
         self.extract_images = self.config.get("extract_images", True)
+        # 页面图像编码格式（PNG 或 JPEG），下游 OCR 通过 PIL 解码，两者均可识别
+        self.image_format = str(self.config.get("image_format", "PNG")).upper()
+        if self.image_format not in PAGE_IMAGE_FORMATS:
+            raise ValueError(
+                f"不支持的页面图像格式: {self.image_format}，可选: {list(PAGE_IMAGE_FORMATS)}"
+            )
+        # pdfminer 版面分析参数（LAParams 字段字典）；默认 None 跳过版面分析，
+        # pdfplumber 自身的文本/表格提取不依赖它，只有需要 LTTextBox 等版面对象时才开启
+        self.pdf_laparams = self.config.get("pdf_laparams")
+        # PDF 解析后端："pdfplumber"（默认）或 "pymupdf"（速度快得多，但文本、线条和表格的
+        # 识别结果与 pdfplumber 不完全一致；未安装 PyMuPDF 时回退到 pdfplumber）
+        self.pdf_backend = str(self.config.get("pdf_backend", "pdfplumber")).lower()
+        # 单个PDF按页段并行解析的工作进程数（默认 1，即在当前进程中逐页解析）
+        self.pdf_page_workers = max(1, int(self.config.get("pdf_page_workers", 1)))
+        # 解析结果磁盘缓存目录（None 表示不缓存）；以 (绝对路径, 修改时间, 大小) 和解析配置为键，
+        # 默认不缓存带页面图像的结果（体积可能很大），cache_images 为真时一并缓存
+        cache_dir = self.config.get("cache_dir")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_images = bool(self.config.get("cache_images", False))
+        self.cache_ttl = self.config.get("cache_ttl", 86400)
         self.logger = get_logger()
 
     def process(self, input_data: str) -> ProcessResult:
@@ -128,24 +275,19 @@ class DocParser(BaseProcessor):
         self.logger.parser_start("Legacy (pdfplumber/python-docx)")
 
         try:
-            if file_type == FileType.PDF:
-                content = self._parse_pdf(file_path)
-            elif file_type == FileType.DOC:
-                content = self._parse_docx(file_path)
-            elif file_type == FileType.EXCEL:
-                content = self._parse_excel(file_path)
-            elif file_type == FileType.PPT:
-                content = self._parse_pptx(file_path)
-            elif file_type in (FileType.HTML,):
-                content = self._parse_html(file_path)
-            elif file_type in (FileType.TXT, FileType.MD):
-                content = self._parse_text(file_path)
-            else:
+            parser = self._PARSERS.get(file_type)
+            if parser is None:
                 self.logger.error(f"不支持的文件类型: {file_type}")
                 return ProcessResult(
                     success=False,
                     errors=[f"不支持的文件类型: {file_type}"]
                 )
+            cache_key = self._cache_key(file_path)
+            content = self._load_cached(cache_key, file_path) if cache_key else None
+            if content is None:
+                content = parser(self, file_path)
+                if cache_key:
+                    self._store_cached(cache_key, content)
 
             # 记录解析结果
             self.logger.elements_detected(
@@ -167,136 +309,173 @@ class DocParser(BaseProcessor):
                 errors=[f"解析文件时出错 {file_path}: {str(e)}"]
             )
 
+    def _cache_key(self, file_path: Path) -> Optional[str]:
+        """计算解析结果的缓存键；未启用缓存或无法读取文件状态时返回None。"""
+        if self.cache_dir is None:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        # 影响解析结果的配置也计入键，修改配置后不会命中旧结果
+        payload = json.dumps(
+            [
+                str(file_path.resolve()), st.st_mtime_ns, st.st_size,
+                type(self).__name__, self.extract_images, self.image_format,
+                self.pdf_backend, self.pdf_laparams,
+            ],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+
+    def _load_cached(self, key: str, file_path: Path) -> Optional[DocContent]:
+        """读取缓存的解析结果，不存在、已过期或损坏时返回None。"""
+        path = self._cache_path(key)
+        try:
+            if self.cache_ttl is not None and time.time() - path.stat().st_mtime > self.cache_ttl:
+                return None
+            with open(path, "rb") as f:
+                content = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if not isinstance(content, DocContent):
+            return None
+        # 同一文件可能经由不同的相对路径访问，路径以本次调用为准
+        content.file_path = str(file_path)
+        self.logger.debug(f"命中解析缓存: {file_path}")
+        return content
+
+    def _store_cached(self, key: str, content: DocContent) -> None:
+        """原子写入解析结果缓存（写入失败不影响解析流程）。"""
+        if content.pages and not self.cache_images:
+            return
+        path = self._cache_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(content, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError):
+            pass
+
+    def process_many(self, paths: List[str], max_workers: Optional[int] = None) -> List[ProcessResult]:
+        """
+        用进程池并行解析多个文档（pdfminer 等解析主要是持有 GIL 的纯 Python 计算）。
+
+        Args:
+            paths: 文档文件路径列表
+            max_workers: 工作进程数（默认 CPU 核数）
+
+        Returns:
+            与 paths 顺序一致的ProcessResult列表
+        """
+        paths = [str(p) for p in paths]
+        max_workers = min(max_workers or os.cpu_count() or 1, len(paths))
+        if max_workers <= 1:
+            return [self.process(p) for p in paths]
+
+        # 每个工作进程按相同配置创建自己的解析器，只在进程间传递路径和解析结果
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_parse_worker,
+            initargs=(type(self), self.config),
+        ) as pool:
+            return list(pool.map(_parse_in_worker, paths, chunksize=4))
+
     def _detect_file_type(self, file_path: Path) -> FileType:
         """从扩展名检测文件类型。"""
-        ext = file_path.suffix.lower()
-        return EXT_TO_FILE_TYPE.get(ext, FileType.TXT)
+        return classify_path(str(file_path)) or FileType.TXT
 
     def _parse_pdf(self, file_path: Path) -> DocContent:
         """解析PDF文档，提取结构化元素信息。"""
-        import io
-        import sys
-        from contextlib import redirect_stderr
-
         doc_id = file_path.stem
 
-        # 抑制 pdfminer 的字体警告（直接打印到 stderr）
-        _stderr = sys.stderr
-        
         # 优先使用pdfplumber（更适合表格和图片）
         try:
             import pdfplumber
-            sys.stderr = io.StringIO()
-
-            pages: List[bytes] = []
-            text_parts: List[str] = []
-
-            # === 结构化元素检测 ===
-            total_images = 0
-            total_tables = 0
-            total_rects = 0
-            total_lines = 0
-            total_curves = 0  # 曲线数量（用于判断图表）
-            table_pages = set()  # 记录有表格的页码
-            image_pages = set()  # 记录有图片的页码
-            possible_scanned_table_pages = set()  # 可能是扫描版表格的页码
-            
-            # 详细表格信息（用于跨页检测）
-            tables_detail = []
-
-            with pdfplumber.open(file_path) as pdf:
-                for page_idx, page in enumerate(pdf.pages):
-                    # 提取文本
-                    page_text = page.extract_text() or ""
-                    text_parts.append(page_text)
-
-                    # 检测表格
-                    page_tables = page.find_tables()
-                    table_bboxes = []
-                    if page_tables:
-                        total_tables += len(page_tables)
-                        table_pages.add(page_idx)
-                        for tbl_idx, tbl in enumerate(page_tables):
-                            bbox = tbl.bbox if hasattr(tbl, 'bbox') else None
-                            table_bboxes.append(bbox)
-                            # 记录表格详细信息（包含列数用于复杂表格判断）
-                            rows = 0
-                            cols = 0
-                            if hasattr(tbl, 'cells') and tbl.cells:
-                                rows = len(set(c[1] for c in tbl.cells if c))  # 根据 top 坐标估算行数
-                                cols = len(set(c[0] for c in tbl.cells if c))  # 根据 left 坐标估算列数
-                            tables_detail.append({
-                                "page": page_idx,
-                                "bbox": bbox,
-                                "rows": rows,
-                                "cols": cols,
-                            })
-                            self.logger.table_info(tbl_idx, page_idx, rows, cols, bbox=bbox)
-
-                    # 检测图片（排除与表格重叠的区域）
-                    page_images = page.images if page.images else []
-                    real_images = self._filter_table_images(page_images, table_bboxes)
-                    if real_images:
-                        total_images += len(real_images)
-                        image_pages.add(page_idx)
-                        
-                        # === 检测可能是扫描版表格的大图片 ===
-                        # 如果没有检测到结构化表格，但有占据大部分页面的图片，可能是扫描版
-                        if not table_bboxes:  # 该页没有结构化表格
-                            page_width = page.width
-                            page_height = page.height
-                            page_area = page_width * page_height
-                            
-                            for img in real_images:
-                                img_width = img.get('width', 0) or (img.get('x1', 0) - img.get('x0', 0))
-                                img_height = img.get('height', 0) or (img.get('y1', 0) - img.get('y0', 0))
-                                img_area = img_width * img_height
-                                
-                                # 如果图片占页面面积 > 50%，可能是扫描版表格
-                                if page_area > 0 and img_area / page_area > 0.5:
-                                    possible_scanned_table_pages.add(page_idx)
-                                    self.logger.debug(
-                                        f"页{page_idx}: 发现大图片 ({img_width:.0f}x{img_height:.0f}), "
-                                        f"占页面 {img_area/page_area:.1%}，可能是扫描版表格"
-                                    )
-
-                    # 检测线条、矩形、曲线
-                    page_lines = len(page.lines) if page.lines else 0
-                    page_rects = len(page.rects) if page.rects else 0
-                    page_curves = len(page.curves) if hasattr(page, 'curves') and page.curves else 0
-                    
-                    total_lines += page_lines
-                    total_rects += page_rects
-                    total_curves += page_curves
-
-                    # 如果启用，提取页面图像（用于 OCR 备用）
-                    if self.extract_images:
-                        img = page.to_image().original
-                        img_bytes = io.BytesIO()
-                        img.save(img_bytes, format='PNG')
-                        pages.append(img_bytes.getvalue())
-
-            # === 改进的 has_chart 判断逻辑 ===
-            # 1. 如果有曲线，很可能是图表（折线图、饼图等）
-            # 2. 如果矩形/线条很多但没有对应表格，可能是流程图/柱状图
-            # 3. 排除表格区域的线条
-            has_chart = self._detect_chart(
-                total_lines=total_lines,
-                total_rects=total_rects,
-                total_curves=total_curves,
-                total_tables=total_tables,
-                page_count=len(pdf.pages)
-            )
-            
-            # 恢复 stderr
-            sys.stderr = _stderr
+
+            with _quiet_stderr():
+                text_parts: List[str] = []
+                page_images: List[Union[Future, bytes]] = []
+
+                # === 结构化元素检测 ===
+                total_images = 0
+                total_tables = 0
+                total_rects = 0
+                total_lines = 0
+                total_curves = 0  # 曲线数量（用于判断图表）
+                # 页面按页码递增顺序处理，每页至多追加一次，列表天然有序且无重复（无需集合和排序）
+                table_pages = []  # 记录有表格的页码
+                image_pages = []  # 记录有图片的页码
+                possible_scanned_table_pages = []  # 可能是扫描版表格的页码
+
+                # 详细表格信息（用于跨页检测）
+                tables_detail = []
+
+                pymupdf = self._import_pymupdf() if self.pdf_backend == "pymupdf" else None
+                # MuPDF 不支持多线程并发调用，整份文档的打开、解析、渲染和关闭都在锁内进行
+                # （with 语句按顺序进入：先取得锁，再打开文档）
+                pdf_lock = _PYMUPDF_LOCK if pymupdf is not None else nullcontext()
+
+                with pdf_lock, (
+                    pymupdf.open(file_path) if pymupdf is not None
+                    else pdfplumber.open(file_path, laparams=self.pdf_laparams)
+                ) as pdf:
+                    if pymupdf is not None:
+                        page_count = pdf.page_count
+                        page_results = self._iter_pymupdf_pages(pdf, pymupdf)
+                    else:
+                        page_count = len(pdf.pages)
+                        # 页数足够多且配置了多个工作进程时按页段并行解析，否则在当前进程中逐页解析
+                        workers = min(self.pdf_page_workers, -(-page_count // PDF_PAGES_PER_TASK))
+                        if workers > 1:
+                            page_results = self._iter_pdf_pages_parallel(file_path, page_count, workers)
+                        else:
+                            page_results = self._iter_pdf_pages(pdf, file_path)
+
+                    for page_idx, (info, image) in enumerate(page_results):
+                        text_parts.append(info["text"])
+                        total_lines += info["lines"]
+                        total_rects += info["rects"]
+                        total_curves += info["curves"]
+                        if info["tables"]:
+                            total_tables += len(info["tables"])
+                            table_pages.append(page_idx)
+                            tables_detail.extend(info["tables"])
+                        if info["images"]:
+                            total_images += info["images"]
+                            image_pages.append(page_idx)
+                        if info["scanned"]:
+                            possible_scanned_table_pages.append(page_idx)
+                        if image is not None:
+                            page_images.append(image)
+
+                pages = [image.result() if isinstance(image, Future) else image for image in page_images]
+
+                # === 改进的 has_chart 判断逻辑 ===
+                # 1. 如果有曲线，很可能是图表（折线图、饼图等）
+                # 2. 如果矩形/线条很多但没有对应表格，可能是流程图/柱状图
+                # 3. 排除表格区域的线条
+                has_chart = self._detect_chart(
+                    total_lines=total_lines,
+                    total_rects=total_rects,
+                    total_curves=total_curves,
+                    total_tables=total_tables,
+                    page_count=page_count
+                )
             
             # === 处理可能的扫描版表格（图片表格）===
             # 如果有大图片但该页没有结构化表格，可能是扫描版/截图表格
             has_image_table = len(possible_scanned_table_pages) > 0
             if has_image_table and total_tables == 0:
                 self.logger.warning(
-                    f"未检测到结构化表格，但页面 {sorted(possible_scanned_table_pages)} 包含大图片，"
+                    f"未检测到结构化表格，但页面 {possible_scanned_table_pages} 包含大图片，"
                     "可能是扫描版表格。建议使用 Docling 解析器或 OCR 进行识别。"
                 )
             
@@ -308,7 +487,7 @@ class DocParser(BaseProcessor):
                 doc_id=doc_id,
                 file_type=FileType.PDF,
                 file_path=str(file_path),
-                page_count=len(pdf.pages) if not pages else len(pages),
+                page_count=page_count if not pages else len(pages),
                 text="\n".join(text_parts),
                 pages=pages,
                 metadata={
@@ -323,18 +502,17 @@ class DocParser(BaseProcessor):
                     "rect_count": total_rects,
                     "line_count": total_lines,
                     "curve_count": total_curves,
-                    "table_pages": sorted(table_pages),
-                    "image_pages": sorted(image_pages),
+                    "table_pages": table_pages,
+                    "image_pages": image_pages,
                     "tables_detail": tables_detail,
                     # 扫描版表格提示（向后兼容）
                     "possible_scanned_table": has_image_table and total_tables == 0,
-                    "possible_scanned_table_pages": sorted(possible_scanned_table_pages),
+                    "possible_scanned_table_pages": possible_scanned_table_pages,
                 }
             )
 
         except ImportError:
-            # pdfplumber 未安装，恢复 stderr 并回退到 PyPDF2
-            sys.stderr = _stderr
+            # pdfplumber 未安装，回退到 PyPDF2
             self.logger.parser_fallback("pdfplumber", "PyPDF2", "pdfplumber 未安装")
             try:
                 import PyPDF2
@@ -367,6 +545,298 @@ class DocParser(BaseProcessor):
                     "请使用: pip install pdfplumber"
                 )
     
+    def _iter_pdf_pages(self, pdf, file_path: Path):
+        """
+        在当前进程中逐页解析PDF，按页码顺序产出 (页面信息, 页面图像Future或None)。
+
+        页面渲染必须在当前线程中进行（pdfminer/pdfium 非线程安全），
+        渲染出的图像交给线程池编码，与后续页面的解析重叠执行
+        （线程池在首次提交时才创建线程）。
+        """
+        image_futures: List[Future] = []
+        with ThreadPoolExecutor(max_workers=PNG_ENCODE_WORKERS) as encoder, \
+                self._open_page_renderer(file_path) as renderer:
+            for page_idx, page in enumerate(pdf.pages):
+                info = self._analyze_pdf_page(page_idx, page)
+                image = None
+                # 如果启用，提取页面图像（用于 OCR 备用）
+                if self.extract_images:
+                    # 积压过多时等待较早的页面编码完成，限制内存中未编码图像的数量
+                    if len(image_futures) >= MAX_PENDING_PAGE_IMAGES:
+                        image_futures[-MAX_PENDING_PAGE_IMAGES].result()
+                    img = self._render_page(page, renderer)
+                    image = encoder.submit(_encode_page_image, img, self.image_format)
+                    image_futures.append(image)
+                yield info, image
+
+    def _iter_pdf_pages_parallel(self, file_path: Path, page_count: int, workers: int):
+        """
+        用进程池按页段并行解析PDF，按页码顺序产出 (页面信息, 页面图像字节或None)。
+
+        每个任务在工作进程中重新打开PDF并解析连续的 PDF_PAGES_PER_TASK 页，
+        pdfminer 的页面解析是持有 GIL 的纯 Python 计算，只有多进程才能利用多核。
+        """
+        ranges = [
+            (start, min(start + PDF_PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PDF_PAGES_PER_TASK)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_analyze_pdf_page_range, type(self), self.config, str(file_path), start, stop)
+                for start, stop in ranges
+            ]
+            for future in futures:
+                yield from future.result()
+
+    def _import_pymupdf(self):
+        """导入 PyMuPDF；未安装时记录回退并返回 None。"""
+        try:
+            import pymupdf
+        except ImportError:
+            self.logger.parser_fallback("PyMuPDF", "pdfplumber", "PyMuPDF 未安装（pip install pymupdf）")
+            return None
+        # 新版 PyMuPDF 首次查找表格时会向 stdout 打印安装 pymupdf_layout 的建议，关闭该提示
+        if hasattr(pymupdf, "no_recommend_layout"):
+            pymupdf.no_recommend_layout()
+        return pymupdf
+
+    def _iter_pymupdf_pages(self, doc, pymupdf):
+        """
+        用 PyMuPDF 逐页解析PDF，产出与 _iter_pdf_pages 相同格式的 (页面信息, 页面图像Future或None)。
+
+        MuPDF 在C层完成内容流解析、文本提取和渲染，比 pdfminer 快一个数量级以上。
+        """
+        from PIL import Image
+
+        matrix = pymupdf.Matrix(PAGE_RENDER_SCALE, PAGE_RENDER_SCALE)
+        image_futures: List[Future] = []
+        with ThreadPoolExecutor(max_workers=PNG_ENCODE_WORKERS) as encoder:
+            for page_idx, page in enumerate(doc):
+                info = self._analyze_pymupdf_page(page_idx, page)
+                image = None
+                if self.extract_images:
+                    if len(image_futures) >= MAX_PENDING_PAGE_IMAGES:
+                        image_futures[-MAX_PENDING_PAGE_IMAGES].result()
+                    pix = page.get_pixmap(matrix=matrix, alpha=False)
+                    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+                    image = encoder.submit(_encode_page_image, img, self.image_format)
+                    image_futures.append(image)
+                yield info, image
+
+    def _analyze_pymupdf_page(self, page_idx: int, page) -> Dict[str, Any]:
+        """检测单个 PyMuPDF 页面的文本和结构化元素，返回与 _analyze_pdf_page 相同的页面信息字典。"""
+        page_text = page.get_text("text").rstrip("\n")
+
+        # 矢量图形：单条线段计为线条，仅由矩形组成的路径按矩形计，其余路径（折线、贝塞尔曲线）计为曲线，
+        # 与 pdfminer 的 LTLine / LTRect / LTCurve 划分一致
+        page_lines = 0
+        page_rects = 0
+        page_curves = 0
+        for path in page.get_drawings():
+            items = path["items"]
+            if len(items) == 1 and items[0][0] == "l":
+                page_lines += 1
+            elif all(item[0] in ("re", "qu") for item in items):
+                page_rects += len(items)
+            else:
+                page_curves += 1
+
+        # 检测表格（与 pdfplumber 路径相同的边数预筛选，PyMuPDF 的 find_tables 同样默认使用 lines 策略）
+        if page_curves or page_lines + 4 * page_rects >= 5:
+            page_tables = page.find_tables().tables
+        else:
+            page_tables = []
+        table_bboxes = []
+        tables_detail = []
+        for tbl_idx, tbl in enumerate(page_tables):
+            bbox = tuple(tbl.bbox)
+            rows = tbl.row_count
+            cols = tbl.col_count
+            table_bboxes.append(bbox)
+            tables_detail.append({
+                "page": page_idx,
+                "bbox": bbox,
+                "rows": rows,
+                "cols": cols,
+            })
+            self.logger.table_info(tbl_idx, page_idx, rows, cols, bbox=bbox)
+
+        # 检测图片：按图片在页面上的放置位置（与 pdfplumber 的图片对象一样，坐标原点在左上角）
+        images = []
+        for info in page.get_image_info():
+            x0, top, x1, bottom = info["bbox"]
+            images.append({
+                "x0": x0, "top": top, "x1": x1, "bottom": bottom,
+                "width": x1 - x0, "height": bottom - top,
+            })
+        rect = page.rect
+        image_count, scanned = self._scan_page_images(
+            page_idx, images, table_bboxes, rect.width, rect.height
+        )
+
+        return {
+            "text": page_text,
+            "lines": page_lines,
+            "rects": page_rects,
+            "curves": page_curves,
+            "tables": tables_detail,
+            "images": image_count,
+            "scanned": scanned,
+        }
+
+    def _analyze_pdf_page(self, page_idx: int, page) -> Dict[str, Any]:
+        """
+        检测单个PDF页面的文本和结构化元素。
+
+        Returns:
+            页面信息字典：text、lines/rects/curves（数量）、tables（表格详细信息列表）、
+            images（排除表格区域后的图片数量）、scanned（是否可能是扫描版表格页）
+        """
+        # page.chars/lines/rects/curves/images 都是对 page.objects 的按类型查找，
+        # 解析一次页面对象后直接从该字典中取出
+        page_objects = page.objects
+
+        # 提取文本（文本只由字符对象组成；扫描页等没有字符的页面跳过文本提取）
+        page_text = (page.extract_text() or "") if page_objects.get("char") else ""
+
+        # 检测线条、矩形、曲线
+        page_lines = len(page_objects.get("line", ()))
+        page_rects = len(page_objects.get("rect", ()))
+        page_curves = len(page_objects.get("curve", ()))
+
+        # 检测表格
+        # find_tables 默认的 lines 策略只用线条/矩形/曲线的边围成单元格，且少于2个单元格的
+        # 不算表格：至少需要5条边（3条平行 + 2条垂直，每个矩形提供4条边），
+        # 边数不足的页面（如纯文本页）不可能检测出表格，跳过开销很大的 find_tables
+        if page_curves or page_lines + 4 * page_rects >= 5:
+            page_tables = page.find_tables()
+        else:
+            page_tables = []
+        table_bboxes = []
+        tables_detail = []
+        for tbl_idx, tbl in enumerate(page_tables):
+            bbox = tbl.bbox if hasattr(tbl, 'bbox') else None
+            table_bboxes.append(bbox)
+            # 记录表格详细信息（包含列数用于复杂表格判断）
+            rows = 0
+            cols = 0
+            cells = getattr(tbl, 'cells', None)
+            if cells:
+                # map + itemgetter 在C层迭代，避免两个Python生成器表达式
+                cells = list(filter(None, cells))
+                rows = len(set(map(itemgetter(1), cells)))  # 根据 top 坐标估算行数
+                cols = len(set(map(itemgetter(0), cells)))  # 根据 left 坐标估算列数
+            tables_detail.append({
+                "page": page_idx,
+                "bbox": bbox,
+                "rows": rows,
+                "cols": cols,
+            })
+            self.logger.table_info(tbl_idx, page_idx, rows, cols, bbox=bbox)
+
+        # 检测图片（排除与表格重叠的区域）
+        image_count, scanned = self._scan_page_images(
+            page_idx, page_objects.get("image", []), table_bboxes, page.width, page.height
+        )
+
+        return {
+            "text": page_text,
+            "lines": page_lines,
+            "rects": page_rects,
+            "curves": page_curves,
+            "tables": tables_detail,
+            "images": image_count,
+            "scanned": scanned,
+        }
+
+    def _scan_page_images(
+        self,
+        page_idx: int,
+        images: List[Dict],
+        table_bboxes: List,
+        page_width: float,
+        page_height: float,
+    ) -> Tuple[int, bool]:
+        """
+        统计页面中（排除表格区域后）的图片，并判断该页是否可能是扫描版表格。
+
+        Returns:
+            (图片数量, 是否可能是扫描版表格页)
+        """
+        real_images = self._filter_table_images(images, table_bboxes)
+        scanned = False
+
+        # === 检测可能是扫描版表格的大图片 ===
+        # 如果没有检测到结构化表格，但有占据大部分页面的图片，可能是扫描版
+        if real_images and not table_bboxes:  # 该页没有结构化表格
+            page_area = page_width * page_height
+            
+            for img in real_images:
+                img_width = img.get('width', 0) or (img.get('x1', 0) - img.get('x0', 0))
+                img_height = img.get('height', 0) or (img.get('y1', 0) - img.get('y0', 0))
+                img_area = img_width * img_height
+                
+                # 如果图片占页面面积 > 50%，可能是扫描版表格
+                if page_area > 0 and img_area / page_area > 0.5:
+                    scanned = True
+                    self.logger.debug(
+                        f"页{page_idx}: 发现大图片 ({img_width:.0f}x{img_height:.0f}), "
+                        f"占页面 {img_area/page_area:.1%}，可能是扫描版表格"
+                    )
+
+        return len(real_images), scanned
+
+    @contextmanager
+    def _open_page_renderer(self, file_path: Path):
+        """
+        打开用于渲染页面图像的 pypdfium2 文档。
+
+        page.to_image() 每渲染一页都会重新打开一次整个PDF，
+        这里整份文档只打开一次。未安装 pypdfium2、无需页面图像或打开失败时返回 None。
+        打开和关闭都持有 _PDFIUM_LOCK。
+        """
+        document = None
+        if self.extract_images and pdfium is not None:
+            try:
+                with _PDFIUM_LOCK:
+                    document = pdfium.PdfDocument(str(file_path))
+            except Exception:
+                document = None
+        try:
+            yield document
+        finally:
+            if document is not None:
+                with _PDFIUM_LOCK:
+                    document.close()
+
+    def _render_page(self, page, renderer):
+        """
+        渲染单页为RGB图像，参数与 pdfplumber page.to_image() 相同。
+
+        页面 bbox 与 cropbox 不一致（需要裁剪）或没有可用的渲染文档时，回退到 page.to_image()。
+        两种方式都经由 PDFium 渲染，整个过程持有 _PDFIUM_LOCK。
+        """
+        with _PDFIUM_LOCK:
+            if renderer is None or page.bbox != page.cropbox:
+                return page.to_image().original
+
+            pdfium_page = renderer[page.page_number - 1]
+            try:
+                bitmap = pdfium_page.render(
+                    scale=PAGE_RENDER_SCALE,
+                    no_smoothtext=True,
+                    no_smoothpath=True,
+                    no_smoothimage=True,
+                    prefer_bgrx=True,
+                )
+                try:
+                    # convert 复制出独立的RGB图像，之后即可在锁内释放位图
+                    return bitmap.to_pil().convert("RGB")
+                finally:
+                    bitmap.close()
+            finally:
+                pdfium_page.close()
+
     def _filter_table_images(self, images: List[Dict], table_bboxes: List) -> List[Dict]:
         """
         过滤掉与表格重叠的图片。
@@ -381,53 +851,38 @@ class DocParser(BaseProcessor):
         Returns:
             过滤后的真正图片列表
         """
-        if not table_bboxes:
+        tables = [tuple(bbox) for bbox in table_bboxes if bbox]
+        if not tables:
             return images
-        
+
+        # 逐对计算重叠面积占图片面积的比例（内联计算，图片面积只算一次）
         real_images = []
         for img in images:
-            img_bbox = (img.get('x0', 0), img.get('top', 0), 
-                       img.get('x1', 0), img.get('bottom', 0))
-            
-            is_table_overlap = False
-            for tbl_bbox in table_bboxes:
-                if tbl_bbox and self._bbox_overlap(img_bbox, tbl_bbox) > 0.5:
-                    is_table_overlap = True
-                    self.logger.debug(f"图片与表格重叠，过滤: img={img_bbox}, table={tbl_bbox}")
-                    break
-            
-            if not is_table_overlap:
+            ix0, iy0 = img.get('x0', 0), img.get('top', 0)
+            ix1, iy1 = img.get('x1', 0), img.get('bottom', 0)
+            img_area = (ix1 - ix0) * (iy1 - iy0)
+
+            overlapped = None
+            if img_area > 0:
+                for tbl_bbox in tables:
+                    tx0, ty0, tx1, ty1 = tbl_bbox
+                    overlap_w = min(ix1, tx1) - max(ix0, tx0)
+                    if overlap_w <= 0:
+                        continue
+                    overlap_h = min(iy1, ty1) - max(iy0, ty0)
+                    if overlap_h > 0 and overlap_w * overlap_h / img_area > 0.5:
+                        overlapped = tbl_bbox
+                        break
+
+            if overlapped is None:
                 real_images.append(img)
-        
+            else:
+                self.logger.debug(
+                    f"图片与表格重叠，过滤: img={(ix0, iy0, ix1, iy1)}, table={overlapped}"
+                )
+
         return real_images
     
-    def _bbox_overlap(self, bbox1: tuple, bbox2: tuple) -> float:
-        """
-        计算两个边界框的重叠比例。
-        
-        Args:
-            bbox1: (x0, y0, x1, y1)
-            bbox2: (x0, y0, x1, y1)
-            
-        Returns:
-            重叠面积占 bbox1 面积的比例
-        """
-        x0 = max(bbox1[0], bbox2[0])
-        y0 = max(bbox1[1], bbox2[1])
-        x1 = min(bbox1[2], bbox2[2])
-        y1 = min(bbox1[3], bbox2[3])
-        
-        if x0 >= x1 or y0 >= y1:
-            return 0.0
-        
-        overlap_area = (x1 - x0) * (y1 - y0)
-        bbox1_area = (bbox1[2] - bbox1[0]) * (bbox1[3] - bbox1[1])
-        
-        if bbox1_area <= 0:
-            return 0.0
-        
-        return overlap_area / bbox1_area
-    
     def _detect_chart(
         self, 
         total_lines: int, 
@@ -525,6 +980,8 @@ class DocParser(BaseProcessor):
         try:
             from docx import Document as DocxDocument
             from docx.opc.constants import RELATIONSHIP_TYPE as RT
+            from docx.oxml.ns import qn
+            from docx.text.paragraph import Paragraph
             from lxml import etree
         except ImportError:
             raise ImportError(
@@ -534,21 +991,18 @@ class DocParser(BaseProcessor):
 
         doc = DocxDocument(file_path)
 
-        # 从段落提取文本
-        text_parts = [p.text for p in doc.paragraphs]
-
+        # 文本、分页符和表格都在下面对 body 子元素的一次遍历中收集
+        # （python-docx 打开文档时已解析完整棵树，无需再次遍历 doc.paragraphs / doc.tables）
+        text_parts = []
+        total_paragraph_lines = 0
         # === 改进的页数估算 ===
-        # 方法1: 检测分页符
+        # 方法1: 检测分页符（在下面遍历 body 时一并统计）
         page_breaks = 0
-        w_ns = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
-        for para in doc.paragraphs:
-            # 检测 <w:br w:type="page"/>
-            breaks = para._element.findall(f'.//{w_ns}br[@{w_ns}type="page"]')
-            page_breaks += len(breaks)
-            # 检测 <w:pageBreakBefore/>
-            if para._element.find(f'.//{w_ns}pageBreakBefore') is not None:
-                page_breaks += 1
-        
+        count_page_breaks = _docx_xpath("count(.//w:br[@w:type='page'])")
+        has_page_break_before = _docx_xpath("boolean(.//w:pageBreakBefore)")
+        count_rows = _docx_xpath("count(.//w:tr)")
+        count_first_row_cells = _docx_xpath("count((.//w:tr)[1]//w:tc)")
+
         # === 结构化元素检测（先收集表格信息用于页数估算） ===
         # 1. 检测表格（包含详细信息）
         tables_detail = []
@@ -558,23 +1012,35 @@ class DocParser(BaseProcessor):
         
         # 遍历文档的 body 子元素，跟踪页码
         body = doc._element.body
+        body_proxy = doc._body
+        w_p = qn('w:p')
         for child in body:
+            # 提取段落文本（与 doc.paragraphs 相同：只取 body 的直接子段落）
+            if child.tag == w_p:
+                paragraph_text = Paragraph(child, body_proxy).text
+                text_parts.append(paragraph_text)
+                if paragraph_text.strip():
+                    total_paragraph_lines += 1
+
             # 检测分页符
             if child.tag.endswith('p'):  # 段落
-                breaks = child.findall(f'.//{w_ns}br[@{w_ns}type="page"]')
+                # 检测 <w:br w:type="page"/>
+                breaks = int(count_page_breaks(child))
                 if breaks:
+                    page_breaks += breaks
                     current_page += 1
-                if child.find(f'.//{w_ns}pageBreakBefore') is not None:
+                # 检测 <w:pageBreakBefore/>
+                if has_page_break_before(child):
+                    page_breaks += 1
                     current_page += 1
             
             # 检测表格
             if child.tag.endswith('tbl'):  # 表格
                 table_pages.add(current_page)
                 # 获取表格行数和列数
-                rows = len(child.findall(f'.//{w_ns}tr'))
+                rows = int(count_rows(child))
                 # 获取列数（从第一行的单元格数量估算）
-                first_row = child.find(f'.//{w_ns}tr')
-                cols = len(first_row.findall(f'.//{w_ns}tc')) if first_row is not None else 0
+                cols = int(count_first_row_cells(child))
                 total_table_rows += rows
                 tables_detail.append({
                     "page": current_page,
@@ -584,7 +1050,6 @@ class DocParser(BaseProcessor):
                 self.logger.table_info(len(tables_detail)-1, current_page, rows, cols)
         
         # 方法2: 基于内容估算（段落 + 表格行数，每50行约1页）
-        total_paragraph_lines = sum(1 for p in doc.paragraphs if p.text.strip())
         total_content_lines = total_paragraph_lines + total_table_rows
         estimated_pages = max(1, total_content_lines // 50 + 1)
         
@@ -592,7 +1057,9 @@ class DocParser(BaseProcessor):
         page_count = max(page_breaks + 1, estimated_pages)
         self.logger.debug(f"DOCX 页数估算: 分页符={page_breaks}, 段落行={total_paragraph_lines}, 表格行={total_table_rows}, 估算页数={page_count}")
         
-        has_table = len(doc.tables) > 0
+        # doc.tables 同样只包含 body 的直接子表格，即上面收集到的表格
+        table_count = len(tables_detail)
+        has_table = table_count > 0
 
         # 2. 检测图片（内联图片 + 关系中的图片）
         has_image = False
@@ -602,28 +1069,28 @@ class DocParser(BaseProcessor):
             if shape.type == 3:  # WD_INLINE_SHAPE_TYPE.PICTURE = 3
                 has_image = True
                 image_count += 1
-        # 检测关系中的图片
-        if not has_image:
-            for rel in doc.part.rels.values():
-                if 'image' in rel.reltype:
-                    has_image = True
-                    image_count += 1
+
+        # 一次遍历关系，同时统计图片和图表（嵌入的 chart）
+        rel_image_count = 0
+        chart_count = 0
+        for rel in doc.part.rels.values():
+            reltype = rel.reltype
+            if 'image' in reltype:
+                rel_image_count += 1
+            if 'chart' in reltype:
+                chart_count += 1
+        # 检测关系中的图片（没有内联图片时）
+        if not has_image and rel_image_count:
+            has_image = True
+            image_count += rel_image_count
 
         # 3. 检测公式（OMML - Office Math Markup Language）
-        has_formula = False
+        # 直接在文档树中查找 <m:oMath>，无需把每个段落序列化为XML字符串
         omml_ns = '{http://schemas.openxmlformats.org/officeDocument/2006/math}'
-        for para in doc.paragraphs:
-            if omml_ns in para._element.xml:
-                has_formula = True
-                break
+        has_formula = doc.element.find(f'.//{omml_ns}oMath') is not None
 
         # 4. 检测图表（嵌入的 chart）
-        has_chart = False
-        chart_count = 0
-        for rel in doc.part.rels.values():
-            if 'chart' in rel.reltype:
-                has_chart = True
-                chart_count += 1
+        has_chart = chart_count > 0
 
         # 检测复杂表格
         has_complex_table = self._detect_complex_table(tables_detail)
@@ -645,7 +1112,7 @@ class DocParser(BaseProcessor):
                 "has_complex_table": has_complex_table,
                 "has_formula": has_formula,
                 "has_chart": has_chart,
-                "table_count": len(doc.tables),
+                "table_count": table_count,
                 "image_count": image_count,
                 "chart_count": chart_count,
                 "table_pages": sorted(table_pages),
@@ -677,12 +1144,25 @@ class DocParser(BaseProcessor):
         formula_count = 0
 
         for sheet in wb.worksheets:
-            # 提取文本
-            for row in sheet.iter_rows(values_only=True):
-                row_text = " ".join(str(cell) for cell in row if cell is not None)
+            # 一次遍历单元格，同时提取文本和检测公式
+            for row in sheet.iter_rows():
+                row_text = " ".join(str(cell.value) for cell in row if cell.value is not None)
                 if row_text.strip():
                     text_parts.append(row_text)
 
+                # 检测公式（检测到足够多就不再检查）
+                if formula_count <= EXCEL_FORMULA_LIMIT:
+                    for cell in row:
+                        data_type = cell.data_type
+                        # 公式单元格类型为 'f'；以 '=' 开头的文本单元格也按公式计
+                        if data_type == 'f' or (
+                            data_type == 's' and isinstance(cell.value, str) and cell.value.startswith('=')
+                        ):
+                            has_formula = True
+                            formula_count += 1
+                            if formula_count > EXCEL_FORMULA_LIMIT:
+                                break
+
             # 检测图片
             if hasattr(sheet, '_images') and sheet._images:
                 has_image = True
@@ -693,17 +1173,6 @@ class DocParser(BaseProcessor):
                 has_chart = True
                 chart_count += len(sheet._charts)
 
-            # 检测公式（遍历单元格检查是否有公式）
-            for row in sheet.iter_rows():
-                for cell in row:
-                    if cell.data_type == 'f' or (cell.value and isinstance(cell.value, str) and cell.value.startswith('=')):
-                        has_formula = True
-                        formula_count += 1
-                        if formula_count > 10:  # 检测到足够多就停止
-                            break
-                if formula_count > 10:
-                    break
-
         wb.close()
 
         return DocContent(
@@ -830,10 +1299,15 @@ class DocParser(BaseProcessor):
                 "请使用: pip install beautifulsoup4"
             )
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            html = f.read()
-
-        soup = BeautifulSoup(html, "html.parser")
+        # 优先使用 lxml（libxml2 的C解析器）直接读取文件字节，未安装时回退到纯Python的 html.parser
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            with open(file_path, "r", encoding="utf-8") as f:
+                soup = BeautifulSoup(f.read(), "html.parser")
+        else:
+            with open(file_path, "rb") as f:
+                soup = BeautifulSoup(f, "lxml", from_encoding="utf-8")
 
         # 移除script和style元素
         for script in soup(["script", "style"]):
@@ -852,16 +1326,8 @@ class DocParser(BaseProcessor):
 
     def _parse_text(self, file_path: Path) -> DocContent:
         """解析纯文本或Markdown文档。"""
-        encodings = ["utf-8", "gbk", "gb2312", "latin-1"]
-
-        text = ""
-        for encoding in encodings:
-            try:
-                with open(file_path, "r", encoding=encoding) as f:
-                    text = f.read()
-                break
-            except UnicodeDecodeError:
-                continue
+        with open(file_path, "rb") as f:
+            text = _decode_text(f.read())
 
         # 估算页数（按行数）
         lines = text.split("\n")
@@ -874,3 +1340,56 @@ class DocParser(BaseProcessor):
             page_count=page_count,
             text=text,
         )
+
+    # 文件类型 -> 解析方法（在类定义末尾建表，取代 process 中的 if/elif 链）
+    _PARSERS: Dict[FileType, Callable[["DocParser", Path], DocContent]] = {
+        FileType.PDF: _parse_pdf,
+        FileType.DOC: _parse_docx,
+        FileType.EXCEL: _parse_excel,
+        FileType.PPT: _parse_pptx,
+        FileType.HTML: _parse_html,
+        FileType.TXT: _parse_text,
+        FileType.MD: _parse_text,
+    }
+
+
+# 工作进程内的解析器（由 _init_parse_worker 在进程启动时创建）
+_worker_parser: Optional[DocParser] = None
+
+
+def _init_parse_worker(parser_cls: type, config: Dict[str, Any]) -> None:
+    """进程池初始化：在工作进程中创建解析器。"""
+    global _worker_parser
+    _worker_parser = parser_cls(config)
+
+
+def _parse_in_worker(path: str) -> ProcessResult:
+    """在工作进程中解析单个文档。"""
+    return _worker_parser.process(path)
+
+
+def _analyze_pdf_page_range(
+    parser_cls: type,
+    config: Dict[str, Any],
+    file_path: str,
+    start: int,
+    stop: int,
+) -> List[Tuple[Dict[str, Any], Optional[bytes]]]:
+    """在工作进程中解析PDF的 [start, stop) 页，返回 (页面信息, 页面图像字节或None) 列表。"""
+    import pdfplumber
+
+    parser = parser_cls(config)
+    path = Path(file_path)
+    results = []
+    # 抑制 pdfminer 直接打印到 stderr 的字体警告
+    with _quiet_stderr(), \
+            pdfplumber.open(path, laparams=parser.pdf_laparams) as pdf, \
+            parser._open_page_renderer(path) as renderer:
+        for page_idx in range(start, stop):
+            page = pdf.pages[page_idx]
+            info = parser._analyze_pdf_page(page_idx, page)
+            image = None
+            if parser.extract_images:
+                image = _encode_page_image(parser._render_page(page, renderer), parser.image_format)
+            results.append((info, image))
+    return results
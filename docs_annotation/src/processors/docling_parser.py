@@ -1,17 +1,26 @@
 """Docling 解析器 - 基于 Docling 库的高精度文档解析。"""
 
 import logging
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
 from ..core.base import BaseProcessor, ProcessResult
-from ..core.schema import DocumentAnnotation, FileType, EXT_TO_FILE_TYPE
+from ..core.schema import DocumentAnnotation, FileType, classify_path
 from ..core.logger import get_logger
 from .doc_parser import DocContent
 
 # 抑制 Docling 内部日志
 logging.getLogger("docling").setLevel(logging.WARNING)
 
+# DocumentConverter 持有版面/表格模型，内存占用大：进程内只构建一个，
+# 所有 DoclingParser 实例（包括各线程各自的 Pipeline）共用
+_converter = None
+_docling_available: Optional[bool] = None
+_converter_init_lock = threading.Lock()
+# DocumentConverter 未保证线程安全，convert() 调用串行执行
+_convert_lock = threading.Lock()
+
 
 class DoclingParser(BaseProcessor):
     """
@@ -47,29 +56,27 @@ class DoclingParser(BaseProcessor):
         self.table_structure = self.config.get("table_structure", True)
         self.extract_images = self.config.get("extract_images", True)
         self.logger = get_logger()
-        
-        # 延迟加载 Docling
-        self._converter = None
-        self._docling_available = None
-    
+
     def _get_converter(self):
-        """延迟加载 Docling DocumentConverter。"""
-        if self._converter is None:
-            try:
-                from docling.document_converter import DocumentConverter
-                self._converter = DocumentConverter()
-                self._docling_available = True
-                self.logger.debug("Docling 加载成功")
-            except ImportError:
-                self._docling_available = False
-                self.logger.warning("Docling 未安装，将使用备用解析器")
-        return self._converter
+        """延迟加载进程内共用的 Docling DocumentConverter（首次调用时构建）。"""
+        global _converter, _docling_available
+        if _docling_available is None:
+            with _converter_init_lock:
+                if _docling_available is None:
+                    try:
+                        from docling.document_converter import DocumentConverter
+                        _converter = DocumentConverter()
+                        _docling_available = True
+                        self.logger.debug("Docling 加载成功")
+                    except ImportError:
+                        _docling_available = False
+                        self.logger.warning("Docling 未安装，将使用备用解析器")
+        return _converter
     
     def is_available(self) -> bool:
         """检查 Docling 是否可用。"""
-        if self._docling_available is None:
-            self._get_converter()
-        return self._docling_available
+        self._get_converter()
+        return _docling_available
     
     def process(self, input_data: str) -> ProcessResult:
         """
@@ -101,8 +108,9 @@ class DoclingParser(BaseProcessor):
             )
         
         try:
-            # 使用 Docling 转换文档
-            conv_result = converter.convert(str(file_path))
+            # 使用 Docling 转换文档（共用的转换器，一次只转换一个文件）
+            with _convert_lock:
+                conv_result = converter.convert(str(file_path))
             doc = conv_result.document
             
             # 提取内容
@@ -130,8 +138,7 @@ class DoclingParser(BaseProcessor):
     
     def _detect_file_type(self, file_path: Path) -> FileType:
         """从扩展名检测文件类型。"""
-        ext = file_path.suffix.lower()
-        return EXT_TO_FILE_TYPE.get(ext, FileType.TXT)
+        return classify_path(str(file_path)) or FileType.TXT
     
     def _extract_content(self, file_path: Path, file_type: FileType, doc) -> DocContent:
         """
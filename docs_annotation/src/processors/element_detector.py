@@ -200,6 +200,14 @@ class ElementDetector(BaseProcessor):
             }
         )
 
+    def _detect_page(self, page_idx: int, page_image: bytes) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """检测单页元素，失败时记录错误并返回 None。"""
+        try:
+            return self.ocr_model.detect_elements(page_image)
+        except Exception as e:
+            self.logger.ocr_error(page_idx, str(e))
+            return None
+
     def _process_with_ocr(self, input_data: DocContent, elements: ElementList) -> ProcessResult:
         """
         使用 OCR 检测页面图像中的元素（用于 PDF）。
@@ -215,14 +223,23 @@ class ElementDetector(BaseProcessor):
 
         self.logger.info(f"使用 OCR 检测 {len(input_data.pages)} 页")
 
-        # 遍历每一页进行检测
-        for page_idx, page_image in enumerate(input_data.pages):
+        pages = input_data.pages
+        for page_idx in range(len(pages)):
+            # 记录 OCR 开始（ocr_start 的 image_size 需为 (宽, 高)，页面字节未解码，不传尺寸）
+            self.logger.ocr_start(page_idx)
+
+        # 所有页面一次交给 OCR 模型，由模型决定是否并行处理
+        try:
+            detections = self.ocr_model.detect_elements_batch(pages)
+        except Exception:
+            # 批量检测失败时逐页重试，只跳过出错的页
+            detections = [self._detect_page(page_idx, page_image) for page_idx, page_image in enumerate(pages)]
+
+        # 遍历每一页的检测结果
+        for page_idx, detected in enumerate(detections):
+            if detected is None:
+                continue
             try:
-                # 记录 OCR 开始
-                self.logger.ocr_start(page_idx, image_size=(len(page_image),) if page_image else None)
-                
-                detected = self.ocr_model.detect_elements(page_image)
-                
                 # 记录 OCR 结果
                 self.logger.ocr_result(page_idx, detected)
 
@@ -10,6 +10,15 @@ from .doc_parser import DocContent
 from .element_detector import ElementList
 
 
+# LLM 特征分析提示词的固定部分（所有文档相同）
+_FEATURE_PROMPT_PREFIX = """分析以下文档的特征，回答以下问题：
+
+请判断：
+1. 表格是否是文档的主要内容（占比超过50%）？
+2. 文档的阅读顺序是否敏感（如：需要按特定顺序阅读才能理解）？
+"""
+
+
 @dataclass
 class FeatureSet:
     """
@@ -283,8 +292,8 @@ class FeatureExtractor(BaseProcessor):
         # 构建分析提示
         text_preview = doc_content.text[:500] if doc_content.text else ""
 
-        prompt = f"""分析以下文档的特征，回答以下问题：
-
+        # 固定说明放在前面、文档信息放在最后，使各请求共享相同的提示词前缀（便于服务端前缀缓存）
+        prompt = f"""{_FEATURE_PROMPT_PREFIX}
 文档信息：
 - 页数: {doc_content.page_count}
 - 图片数量: {len(elements.images)}
@@ -292,10 +301,6 @@ class FeatureExtractor(BaseProcessor):
 - 公式数量: {len(elements.formulas)}
 - 图表数量: {len(elements.charts)}
 - 文本预览: {text_preview}
-
-请判断：
-1. 表格是否是文档的主要内容（占比超过50%）？
-2. 文档的阅读顺序是否敏感（如：需要按特定顺序阅读才能理解）？
 """
 
         # 构建schema
@@ -11,6 +11,18 @@ from .element_detector import ElementList
 from .feature_extractor import FeatureSet
 
 
+# LLM 布局分类提示词的固定部分（所有文档相同）
+_LAYOUT_PROMPT_PREFIX = """分析以下文档的布局类型。
+
+布局类型说明：
+- single: 单页布局，每页内容独立，如论文、报告
+- double: 双页布局，内容跨页连续展开，如折页图、长表格
+- mixed: 混合布局，既有单页内容也有跨页内容
+
+请判断文档属于哪种布局类型。
+"""
+
+
 class LayoutClassifier(BaseProcessor):
     """
     布局分类器 - 判断文档的布局类型。
@@ -152,8 +164,8 @@ class LayoutClassifier(BaseProcessor):
         """
         text_preview = doc_content.text[:500] if doc_content.text else ""
 
-        prompt = f"""分析以下文档的布局类型。
-
+        # 固定说明放在前面、文档信息放在最后，使各请求共享相同的提示词前缀（便于服务端前缀缓存）
+        prompt = f"""{_LAYOUT_PROMPT_PREFIX}
 文档信息：
 - 页数: {doc_content.page_count}
 - 图片数量: {len(elements.images)}
@@ -161,13 +173,6 @@ class LayoutClassifier(BaseProcessor):
 - 跨页表格: {features.cross_page_table}
 - 长表格: {features.long_table}
 - 文本预览: {text_preview}
-
-布局类型说明：
-- single: 单页布局，每页内容独立，如论文、报告
-- double: 双页布局，内容跨页连续展开，如折页图、长表格
-- mixed: 混合布局，既有单页内容也有跨页内容
-
-请判断文档属于哪种布局类型。
 """
 
         try:
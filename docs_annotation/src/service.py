@@ -1,12 +1,14 @@
 """文档标注服务 - 统一入口。"""
 
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
 from .core.pipeline import Pipeline
-from .core.schema import DocumentAnnotation
+from .core.schema import DocumentAnnotation, path_suffix
 from .core.logger import get_logger, set_log_level
 from .processors.doc_parser import DocParser, ParserBackend, create_parser
 from .processors.element_detector import ElementDetector
@@ -31,6 +33,9 @@ class AnnotationService:
         annotation = service.annotate("document.pdf")
     """
 
+    # 流水线阶段切分点：文档解析 | 元素检测（OCR） | 特征提取 + 布局分类（LLM）
+    PIPELINE_STAGE_BOUNDARIES = (1, 2)
+
     def __init__(
         self,
         ocr_model: Optional[OCRModel] = None,
@@ -56,6 +61,13 @@ class AnnotationService:
         self.logger = get_logger(level=log_level)
         set_log_level(log_level)
 
+        # 每个线程各自构建一次 Pipeline（解析器及各处理器实例按线程独立，构建开销很小），
+        # 并在该线程处理的所有文件间复用。以下组件仍由所有线程共用，需自行保证线程安全：
+        # - ocr_model / llm_model：PaddleOCRModel 在实例锁内串行调用预测器
+        # - Docling 的 DocumentConverter：进程内只构建一个，convert() 串行执行
+        # - DocParser 的 PDFium / PyMuPDF 调用：由模块级锁串行化
+        self._local = threading.local()
+
     def annotate(self, file_path: str) -> DocumentAnnotation:
         """
         标注文档。
@@ -67,16 +79,14 @@ class AnnotationService:
             DocumentAnnotation: 标注结果
         """
         # 检测文件类型
-        from pathlib import Path
-        ext = Path(file_path).suffix.lower()
-        file_type = ext.lstrip('.')
+        file_type = path_suffix(file_path).lstrip('.')
         
         # 记录开始
         start_time = time.time()
         self.logger.file_start(file_path, file_type)
         
-        # 1. 构建Pipeline
-        pipeline = self._build_pipeline()
+        # 1. 获取（首次调用时构建）Pipeline
+        pipeline = self._get_pipeline()
 
         # 2. 执行
         result = pipeline.execute(file_path)
@@ -92,18 +102,25 @@ class AnnotationService:
         self.logger.file_end(file_path, success=True, duration_ms=duration_ms)
         return result.data
 
-    def annotate_batch(self, file_paths: list[str]) -> list[DocumentAnnotation]:
+    def annotate_batch(
+        self, file_paths: list[str], max_workers: int = 8
+    ) -> list[DocumentAnnotation]:
         """
         批量标注文档。
 
         Args:
             file_paths: 文档文件路径列表
+            max_workers: 最大并发数（<= 1 时顺序执行）
 
         Returns:
             标注结果列表
         """
-        pipeline = self._build_pipeline()
-        results = pipeline.execute_batch(file_paths)
+        if max_workers <= 1 or len(file_paths) <= 1:
+            results = self._get_pipeline().execute_batch(file_paths)
+        else:
+            # 每个工作线程使用自己的 Pipeline（ocr_model / llm_model 仍为共用实例）
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as pool:
+                results = list(pool.map(lambda path: self._get_pipeline().execute(path), file_paths))
 
         annotations = []
         for result in results:
@@ -115,6 +132,55 @@ class AnnotationService:
 
         return annotations
 
+    def annotate_stream(
+        self,
+        file_paths: Iterable[str],
+        queue_size: int = 32,
+    ) -> Iterator[Tuple[str, Optional[DocumentAnnotation], Optional[str]]]:
+        """
+        流水线式批量标注文档。
+
+        文档解析、元素检测（OCR）、特征提取与布局分类（LLM）三个阶段
+        各由一个线程执行，通过有界队列衔接，不同文档的各阶段相互重叠。
+
+        Args:
+            file_paths: 文档文件路径迭代器
+            queue_size: 阶段间队列的最大长度
+
+        Yields:
+            (文件路径, 标注结果, 错误信息)，成功时错误信息为 None，失败时标注结果为 None
+        """
+        # 各阶段线程在调用方让出期间仍在运行，使用独立的 Pipeline，
+        # 避免与同一线程中的 annotate() 共用处理器
+        pipeline = self._build_pipeline()
+        start_times: Dict[str, float] = {}
+
+        def started():
+            for file_path in file_paths:
+                start_times[file_path] = time.time()
+                self.logger.file_start(file_path, path_suffix(file_path).lstrip('.'))
+                yield file_path
+
+        staged = pipeline.execute_staged(
+            started(),
+            boundaries=self.PIPELINE_STAGE_BOUNDARIES,
+            queue_size=queue_size,
+        )
+        for file_path, result in staged:
+            duration_ms = (time.time() - start_times.pop(file_path)) * 1000
+            self.logger.file_end(file_path, success=result.success, duration_ms=duration_ms)
+            if result.success:
+                yield file_path, result.data, None
+            else:
+                yield file_path, None, f"Annotation failed: {result.errors}"
+
+    def _get_pipeline(self) -> Pipeline:
+        """获取当前线程的处理Pipeline（该线程首次调用时构建）。"""
+        pipeline = getattr(self._local, "pipeline", None)
+        if pipeline is None:
+            pipeline = self._local.pipeline = self._build_pipeline()
+        return pipeline
+
     def _build_pipeline(self) -> Pipeline:
         """
         构建处理Pipeline。
@@ -160,8 +226,8 @@ class AnnotationService:
         output.parent.mkdir(parents=True, exist_ok=True)
 
         if format == "json":
-            with open(output, "w", encoding="utf-8") as f:
-                f.write(annotation.to_json())
+            # 直接序列化为字节串后一次写入
+            output.write_bytes(annotation.to_json_bytes())
         elif format == "yaml":
             import yaml
             with open(output, "w", encoding="utf-8") as f:
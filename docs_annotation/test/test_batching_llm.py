@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""测试 BatchingLLM 微批代理。
+
+测试目标：
+1. 同类请求数量达到 batch_size 时立即合并为一批
+2. 请求不足一批时，等待 max_wait_ms 后按超时触发
+3. 底层模型返回的结果数量与请求数不符时，所有调用方都收到异常
+
+使用方法：
+    python -m test.test_batching_llm
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 添加正确的路径
+script_dir = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(script_dir))
+
+from models.llm import BatchingLLM, MockLLM
+
+
+OPTIONS = ["a", "b"]
+
+
+class RecordingLLM(MockLLM):
+    """记录每次批量调用的提示词，结果的 reasoning 回显对应提示词。"""
+
+    def __init__(self, drop_last: bool = False):
+        self.batches: List[List[str]] = []
+        self.drop_last = drop_last
+
+    def classify_batch(self, prompts: List[str], options: List[str]) -> List[Dict[str, Any]]:
+        self.batches.append(list(prompts))
+        results = [
+            {"label": options[0], "confidence": 1.0, "reasoning": prompt}
+            for prompt in prompts
+        ]
+        return results[:-1] if self.drop_last else results
+
+
+def _classify_concurrently(llm: BatchingLLM, prompts: List[str]) -> Dict[str, Any]:
+    """每个提示词一个线程并发调用 classify，返回 提示词 -> 结果或异常。"""
+    outcomes: Dict[str, Any] = {}
+
+    def call(prompt: str):
+        try:
+            outcomes[prompt] = llm.classify(prompt, OPTIONS)
+        except Exception as e:
+            outcomes[prompt] = e
+
+    threads = [threading.Thread(target=call, args=(prompt,)) for prompt in prompts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not any(thread.is_alive() for thread in threads), "调用方未返回"
+    return outcomes
+
+
+def test_size_triggered_flush():
+    """请求数达到 batch_size 时不等待超时，一次处理。"""
+    model = RecordingLLM()
+    llm = BatchingLLM(model, batch_size=4, max_wait_ms=60_000)
+    prompts = [f"doc-{i}" for i in range(4)]
+
+    start = time.monotonic()
+    outcomes = _classify_concurrently(llm, prompts)
+
+    assert time.monotonic() - start < 5
+    assert len(model.batches) == 1
+    assert sorted(model.batches[0]) == prompts
+    for prompt in prompts:
+        assert outcomes[prompt]["reasoning"] == prompt
+
+
+def test_timeout_triggered_flush():
+    """请求不足一批时，最早的请求等待 max_wait_ms 后触发。"""
+    model = RecordingLLM()
+    llm = BatchingLLM(model, batch_size=16, max_wait_ms=200)
+    prompts = ["doc-0", "doc-1"]
+
+    start = time.monotonic()
+    outcomes = _classify_concurrently(llm, prompts)
+
+    assert time.monotonic() - start >= 0.2
+    assert sum(len(batch) for batch in model.batches) == 2
+    for prompt in prompts:
+        assert outcomes[prompt]["reasoning"] == prompt
+
+
+def test_result_count_mismatch():
+    """结果少于请求数时，批内每个调用方都收到异常而不是一直等待。"""
+    model = RecordingLLM(drop_last=True)
+    llm = BatchingLLM(model, batch_size=3, max_wait_ms=60_000)
+    prompts = [f"doc-{i}" for i in range(3)]
+
+    outcomes = _classify_concurrently(llm, prompts)
+
+    for prompt in prompts:
+        assert isinstance(outcomes[prompt], ValueError)
+
+
+def main():
+    tests = [test_size_triggered_flush, test_timeout_triggered_flush, test_result_count_mismatch]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK]   {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
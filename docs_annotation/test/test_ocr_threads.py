@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""测试 PaddleOCRModel 在多线程共享时串行调用预测器。
+
+测试目标：
+1. 多个线程同时调用 detect_elements 时，底层 ocr() 不会并发执行
+2. 每个调用方都能拿到检测结果
+
+PaddleOCR 未安装时使用模拟的 paddleocr 模块，只检查调用是否重叠。
+
+使用方法：
+    python -m test.test_ocr_threads
+"""
+
+import io
+import sys
+import time
+import types
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+# 添加正确的路径
+script_dir = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(script_dir))
+
+from models.ocr import PaddleOCRModel
+
+
+class FakePaddleOCR:
+    """模拟 PaddleOCR 预测器：记录同时处于 ocr() 中的最大调用数。"""
+
+    def __init__(self, **kwargs):
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self._counter_lock = threading.Lock()
+
+    def ocr(self, image, cls=True):
+        with self._counter_lock:
+            self.active += 1
+            self.calls += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        with self._counter_lock:
+            self.active -= 1
+        return [[]]
+
+
+def _page_image() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_detect_elements_from_threads():
+    """8 个线程共享一个 PaddleOCRModel，ocr() 调用不重叠。"""
+    fake_module = types.ModuleType("paddleocr")
+    fake_module.PaddleOCR = FakePaddleOCR
+    saved = sys.modules.get("paddleocr")
+    sys.modules["paddleocr"] = fake_module
+    try:
+        model = PaddleOCRModel()
+    finally:
+        if saved is None:
+            del sys.modules["paddleocr"]
+        else:
+            sys.modules["paddleocr"] = saved
+
+    image_data = _page_image()
+    results = []
+
+    def call():
+        for _ in range(3):
+            results.append(model.detect_elements(image_data))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert not any(thread.is_alive() for thread in threads), "调用方未返回"
+    assert model.model.calls == 24
+    assert model.model.max_active == 1, f"ocr() 并发调用数: {model.model.max_active}"
+    assert len(results) == 24
+    assert all(result["images"] == [] for result in results)
+
+
+def main():
+    tests = [test_detect_elements_from_threads]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[OK]   {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()